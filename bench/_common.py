@@ -0,0 +1,83 @@
+# bench/_common.py
+# 本機 benchmark 共用工具：SQLite 資料庫、in-process ASGI 壓測、統計輸出
+# 需要 requirements-dev.txt 裡的開發相依套件（httpx）：pip install -r requirements-dev.txt
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+
+def use_sqlite(path: Optional[str] = None) -> str:
+    """把 DATABASE_URL 指到一個本機 SQLite 檔；必須在 import services.api 之前呼叫。"""
+    if path is None:
+        path = os.path.join(tempfile.mkdtemp(prefix="jq-bench-"), "bench.db")
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{path}"
+    os.environ.setdefault("DB_ECHO", "0")
+    return path
+
+
+def percentile(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, round(q / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+def summarize(latencies: list[float], elapsed: float, errors: int = 0) -> dict[str, Any]:
+    n = len(latencies)
+    return {
+        "requests": n,
+        "errors": errors,
+        "elapsed_s": round(elapsed, 4),
+        "rps": round(n / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+    }
+
+
+async def drive(
+    client: Any,
+    make_request: Callable[[Any, int], Any],
+    total: int,
+    concurrency: int,
+) -> dict[str, Any]:
+    """用 concurrency 個 worker 打完 total 個請求；make_request(client, i) 回傳 awaitable response。"""
+    latencies: list[float] = []
+    errors = 0
+    counter = iter(range(total))
+
+    async def worker() -> None:
+        nonlocal errors
+        for i in counter:
+            t0 = time.perf_counter()
+            resp = await make_request(client, i)
+            latencies.append(time.perf_counter() - t0)
+            if resp.status_code >= 400:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, time.perf_counter() - start, errors)
+
+
+def asgi_client(app: Any, **kwargs: Any):
+    import httpx
+
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", **kwargs)
+
+
+def emit(result: dict[str, Any], out: Optional[str] = None) -> None:
+    text = json.dumps(result, indent=2, ensure_ascii=False, default=str)
+    if out:
+        Path(out).write_text(text + "\n", encoding="utf-8")
+    print(text)
@@ -0,0 +1,68 @@
+# bench/auth_throughput.py
+# 量測帶 Bearer token 的請求吞吐量（claims 快取冷/熱），以及登入尖峰期間其他路由的延遲
+#
+#   python -m bench.auth_throughput --requests 5000 --concurrency 50
+import argparse
+import asyncio
+
+from bench._common import asgi_client, drive, emit, use_sqlite
+
+
+async def main(args) -> dict:
+    use_sqlite(args.db)
+    from services.api.database import close_db, init_db
+    from services.api.main import app
+    from services.api.services import auth_service
+
+    await init_db()
+    async with asgi_client(app) as client:
+        creds = {"email": "bench@jq.local", "password": "bench-password"}
+        await client.post("/auth/register", json=creds)
+        token = (await client.post("/auth/login", json=creds)).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        async def ping(c, _i):
+            return await c.get("/health/ping")
+
+        async def me(c, _i):
+            return await c.get("/auth/me", headers=headers)
+
+        baseline = await drive(client, ping, args.requests, args.concurrency)
+        warm = await drive(client, me, args.requests, args.concurrency)
+
+        # 關掉 claims 快取：每個請求都重新驗簽
+        size = auth_service.claims_cache.max_size
+        auth_service.claims_cache.max_size = 0
+        auth_service.claims_cache.clear()
+        cold = await drive(client, me, args.requests, args.concurrency)
+        auth_service.claims_cache.max_size = size
+
+        # 登入尖峰：密碼雜湊在 thread pool，/health/ping 不應被拖慢
+        async def login(c, _i):
+            return await c.post("/auth/login", json=creds)
+
+        logins = asyncio.ensure_future(drive(client, login, args.logins, args.logins))
+        during_logins = await drive(client, ping, args.requests // 5, args.concurrency)
+        login_burst = await logins
+    await close_db()
+
+    return {
+        "benchmark": "auth_throughput",
+        "concurrency": args.concurrency,
+        "ping_baseline": baseline,
+        "auth_me_claims_cached": warm,
+        "auth_me_verify_every_request": cold,
+        "ping_during_login_burst": during_logins,
+        "login_burst": login_burst,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--db", default=None)
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--logins", type=int, default=32)
+    parser.add_argument("--out", default=None)
+    args = parser.parse_args()
+    emit(asyncio.run(main(args)), args.out)
@@ -0,0 +1,71 @@
+# bench/bulk_write.py
+# 離線同步情境：500 筆日記逐筆 POST /journals/ 對比一次 POST /journals/batch
+#
+#   python -m bench.bulk_write --items 500
+import argparse
+import asyncio
+import time
+
+from bench._common import asgi_client, emit, use_sqlite
+
+
+async def login(client, email: str) -> dict:
+    creds = {"email": email, "password": "bench-password"}
+    await client.post("/auth/register", json=creds)
+    token = (await client.post("/auth/login", json=creds)).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _items(prefix: str, n: int) -> list[dict]:
+    return [{"client_id": f"{prefix}-{i}", "title": f"日記 {i}", "content": "離線寫的內容" * 20} for i in range(n)]
+
+
+async def main(args) -> dict:
+    use_sqlite(args.db)
+    from services.api.database import close_db, init_db
+    from services.api.main import app
+
+    await init_db()
+    async with asgi_client(app) as client:
+        # 逐筆：手機依序送出，每筆一個 round trip + 一個 transaction
+        headers = await login(client, "single@jq.local")
+        start = time.perf_counter()
+        for item in _items("single", args.items):
+            body = {"title": item["title"], "content": item["content"]}
+            resp = await client.post("/journals/", json=body, headers=headers)
+            resp.raise_for_status()
+        single_s = time.perf_counter() - start
+
+        headers = await login(client, "batch@jq.local")
+        items = _items("batch", args.items)
+        start = time.perf_counter()
+        resp = await client.post("/journals/batch", json={"items": items}, headers=headers)
+        resp.raise_for_status()
+        batch_s = time.perf_counter() - start
+        created = resp.json()["created"]
+
+        # 重送同一批：應全部回報 updated，不會多出重複資料
+        start = time.perf_counter()
+        retry = (await client.post("/journals/batch", json={"items": items}, headers=headers)).json()
+        retry_s = time.perf_counter() - start
+    await close_db()
+
+    return {
+        "benchmark": "bulk_write",
+        "items": args.items,
+        "single_posts_s": round(single_s, 4),
+        "batch_s": round(batch_s, 4),
+        "batch_created": created,
+        "batch_retry_s": round(retry_s, 4),
+        "batch_retry_updated": retry["updated"],
+        "speedup": round(single_s / batch_s, 1) if batch_s else None,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--db", default=None)
+    parser.add_argument("--items", type=int, default=500)
+    parser.add_argument("--out", default=None)
+    args = parser.parse_args()
+    emit(asyncio.run(main(args)), args.out)
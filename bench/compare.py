@@ -0,0 +1,110 @@
+# bench/compare.py
+# 比較兩份 benchmark JSON（通常是 bench.suite 的輸出），列出退步的指標；有退步時以非 0 結束
+#
+# 依 key 名稱判斷方向：rps 越大越好，*_ms / *_us 越小越好；其餘（請求數、設定值、elapsed_s 等）不比較。
+# errors 不套用 tolerance：只要比 baseline 多就算退步（失敗的請求也會讓延遲看起來變好）。
+# 延遲很小時相對變化容易被雜訊放大，低於 --min-delta-ms 的絕對差不算退步。
+#
+#   python -m bench.compare baseline.json current.json --tolerance 0.1
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+
+def flatten(data: Any, prefix: str = "") -> Iterator[tuple[str, Any]]:
+    if isinstance(data, dict):
+        for key, value in data.items():
+            yield from flatten(value, f"{prefix}.{key}" if prefix else str(key))
+    elif isinstance(data, (int, float)) and not isinstance(data, bool):
+        yield prefix, data
+
+
+def _direction(metric: str) -> Optional[int]:
+    """+1：越大越好；-1：越小越好；None：不比較。"""
+    leaf = metric.rsplit(".", 1)[-1]
+    if leaf == "rps":
+        return 1
+    if leaf.endswith("_ms") or leaf.endswith("_us"):
+        return -1
+    return None
+
+
+def _is_errors(metric: str) -> bool:
+    return metric.rsplit(".", 1)[-1] == "errors"
+
+
+def _ms(metric: str, value: float) -> float:
+    return value / 1000 if metric.endswith("_us") else value
+
+
+def _severity(row: dict[str, Any]) -> float:
+    # errors 的變化排最前面
+    return float("inf") if row["change"] is None else abs(row["change"])
+
+
+def compare(
+    baseline: dict[str, Any], current: dict[str, Any], tolerance: float = 0.1, min_delta_ms: float = 0.5
+) -> dict[str, Any]:
+    base = dict(flatten(baseline))
+    regressions, improvements = [], []
+    compared = 0
+    for metric, value in flatten(current):
+        direction = _direction(metric)
+        old = base.get(metric)
+        if _is_errors(metric) and old is not None:
+            compared += 1
+            # baseline 常常是 0，沒有相對變化可算，change 記 None
+            row = {"metric": metric, "baseline": old, "current": value, "change": None}
+            if value > old:
+                regressions.append(row)
+            elif value < old:
+                improvements.append(row)
+            continue
+        if direction is None or old is None or old == 0:
+            continue
+        compared += 1
+        if direction < 0 and abs(_ms(metric, value) - _ms(metric, old)) < min_delta_ms:
+            continue
+        change = (value - old) / old
+        row = {"metric": metric, "baseline": old, "current": value, "change": round(change, 4)}
+        if change * direction < -tolerance:
+            regressions.append(row)
+        elif change * direction > tolerance:
+            improvements.append(row)
+    return {
+        "tolerance": tolerance,
+        "compared": compared,
+        "regressions": sorted(regressions, key=_severity, reverse=True),
+        "improvements": sorted(improvements, key=_severity, reverse=True),
+    }
+
+
+def load(path: str) -> dict[str, Any]:
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
+
+def _change(row: dict[str, Any]) -> str:
+    return "" if row["change"] is None else f" ({row['change']:+.1%})"
+
+
+def report(result: dict[str, Any]) -> str:
+    lines = [f"compared {result['compared']} metrics (tolerance {result['tolerance']:.0%})"]
+    for title, rows in (("REGRESSIONS", result["regressions"]), ("improvements", result["improvements"])):
+        if rows:
+            lines.append(f"{title}:")
+            lines.extend(f"  {r['metric']}: {r['baseline']} -> {r['current']}{_change(r)}" for r in rows)
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="相對變化超過這個比例才算退步")
+    parser.add_argument("--min-delta-ms", type=float, default=0.5)
+    args = parser.parse_args()
+    result = compare(load(args.baseline), load(args.current), args.tolerance, args.min_delta_ms)
+    print(report(result))
+    sys.exit(1 if result["regressions"] else 0)
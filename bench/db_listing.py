@@ -0,0 +1,132 @@
+# bench/db_listing.py
+# 比較舊版同步 engine（threadpool + Session）與新版 async engine 在 /users 列表的吞吐量
+#
+# speedup 只比較 engine：兩邊都是沒有 middleware、沒有驗證的裸 FastAPI app，route 與查詢完全相同。
+# 另外附上完整 app（管理者驗證查詢、metrics / CORS / 快取 middleware）的 /users/ 數字作為參考，
+# 不列入 speedup。
+#
+#   python -m bench.db_listing --requests 2000 --concurrency 50
+import argparse
+import asyncio
+
+from bench._common import asgi_client, drive, emit, use_sqlite
+
+
+def build_sync_app(db_path: str, echo: bool):
+    # 還原改版前 database.py 的寫法：create_engine + SessionLocal + 同步 get_db
+    from fastapi import Depends, FastAPI
+    from sqlalchemy import create_engine, select
+    from sqlalchemy.orm import Session, sessionmaker
+
+    from services.api.models.user import User
+
+    engine = create_engine(f"sqlite:///{db_path}", echo=echo, future=True)
+    SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+
+    def get_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+
+    @app.get("/users/")
+    def list_users(limit: int = 50, db: Session = Depends(get_db)):
+        rows = db.scalars(select(User).order_by(User.id).limit(limit)).all()
+        return {
+            "items": [
+                {"id": u.id, "email": u.email, "nickname": u.nickname, "created_at": u.created_at}
+                for u in rows
+            ]
+        }
+
+    return app, engine
+
+
+def build_async_app():
+    # 與 build_sync_app 相同的 route，只換成 database.py 的 async engine 與 get_db
+    from fastapi import Depends, FastAPI
+    from sqlalchemy import select
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from services.api.database import get_db
+    from services.api.models.user import User
+
+    app = FastAPI()
+
+    @app.get("/users/")
+    async def list_users(limit: int = 50, db: AsyncSession = Depends(get_db)):
+        rows = (await db.scalars(select(User).order_by(User.id).limit(limit))).all()
+        return {
+            "items": [
+                {"id": u.id, "email": u.email, "nickname": u.nickname, "created_at": u.created_at}
+                for u in rows
+            ]
+        }
+
+    return app
+
+
+async def seed(n_users: int) -> dict[str, str]:
+    """建立 n_users 位使用者（第一位是管理者），回傳管理者的 Authorization header。"""
+    from services.api.database import SessionLocal, init_db
+    from services.api.models.user import User
+    from services.api.services import auth_service
+
+    await init_db()
+    async with SessionLocal() as db:
+        users = [User(email=f"user{i}@bench.local", nickname=f"user{i}", is_admin=i == 0) for i in range(n_users)]
+        db.add_all(users)
+        await db.flush()
+        tokens = await auth_service.issue_tokens(db, users[0].id)
+        await db.commit()
+    return {"Authorization": f"Bearer {tokens['access_token']}"}
+
+
+async def main(args) -> dict:
+    db_path = use_sqlite(args.db)
+    from services.api.database import close_db
+    from services.api.main import app
+
+    headers = await seed(args.users)
+    path = f"/users/?limit={args.limit}"
+
+    async def hit(client, _i):
+        return await client.get(path, headers=headers)
+
+    sync_app, sync_engine = build_sync_app(db_path, args.echo)
+    async with asgi_client(sync_app) as client:
+        before = await drive(client, hit, args.requests, args.concurrency)
+    sync_engine.dispose()
+
+    async with asgi_client(build_async_app()) as client:
+        after = await drive(client, hit, args.requests, args.concurrency)
+
+    async with asgi_client(app) as client:
+        full_app = await drive(client, hit, args.requests, args.concurrency)
+    await close_db()
+
+    return {
+        "benchmark": "db_listing",
+        "path": path,
+        "concurrency": args.concurrency,
+        "sync_engine": before,
+        "async_engine": after,
+        "speedup": round(after["rps"] / before["rps"], 2) if before["rps"] else None,
+        "async_full_app": full_app,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--db", default=None, help="SQLite 檔路徑（預設建立暫存檔）")
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--echo", action="store_true", help="同步版沿用舊設定 echo=True")
+    parser.add_argument("--out", default=None, help="結果輸出 JSON 檔")
+    args = parser.parse_args()
+    emit(asyncio.run(main(args)), args.out)
@@ -0,0 +1,125 @@
+# bench/home_feed.py
+# /home（預先維護的摘要 + 並行即時查詢）對比兩種 naive 作法的 p95 延遲：
+#   - client fan-out：前端分別打 /auth/me、/journals、/missions、/cards 再自己組
+#   - server 每次重算：同一個請求內依序跑完所有聚合查詢（唯讀）
+#
+# 請求走 in-process ASGI，沒有網路延遲：fan-out 在真實 client 上多出的三次往返不會反映在數字裡，
+# 而且 /missions、/cards 會命中回應快取。這裡比較的是伺服器端成本，不是使用者感受到的延遲。
+#
+#   python -m bench.home_feed --journals 3000 --requests 1000 --concurrency 20
+import argparse
+import asyncio
+import random
+from datetime import timedelta
+
+from bench._common import asgi_client, drive, emit, use_sqlite
+
+
+async def seed(client, args) -> dict:
+    from services.api.database import SessionLocal, utcnow
+    from services.api.models import Card, Journal, Mission, MissionProgress, UserCard
+    from services.api.services import home_service
+
+    creds = {"email": "home@jq.local", "password": "bench-password"}
+    user_id = (await client.post("/auth/register", json=creds)).json()["id"]
+    token = (await client.post("/auth/login", json=creds)).json()["access_token"]
+
+    now = utcnow()
+    rng = random.Random(42)
+    async with SessionLocal() as db:
+        cards = [Card(code=f"card{i}", name=f"卡片 {i}") for i in range(args.cards)]
+        missions = [Mission(title=f"任務 {i}") for i in range(args.missions)]
+        db.add_all(cards + missions)
+        await db.flush()
+        db.add_all(
+            Journal(
+                user_id=user_id,
+                title=f"日記 {i}",
+                content="今天的心情很好" * 10,
+                created_at=now - timedelta(minutes=rng.randint(0, 365 * 24 * 60)),
+            )
+            for i in range(args.journals)
+        )
+        db.add_all(
+            MissionProgress(user_id=user_id, mission_id=m.id, progress=rng.randint(0, 100), completed=i % 3 == 0)
+            for i, m in enumerate(missions)
+        )
+        db.add_all(
+            UserCard(user_id=user_id, card_id=c.id, unlocked_at=now - timedelta(days=rng.randint(0, 30)))
+            for c in cards[: args.cards // 2]
+        )
+        await db.commit()
+    await home_service.refresh_all_summaries()
+    return {"Authorization": f"Bearer {token}"}
+
+
+def mount_naive_route(app) -> None:
+    from fastapi import Depends
+
+    from services.api.database import SessionLocal
+    from services.api.services import home_service
+    from services.api.services.auth_service import AuthUser, get_current_user
+
+    @app.get("/bench/home-naive")
+    async def home_naive(user: AuthUser = Depends(get_current_user)):
+        # 每次都從來源表重算摘要，再依序跑其餘查詢（唯讀，不寫回 user_summaries）
+        async with SessionLocal() as db:
+            summary = await home_service._compute_summary(db, user.id)
+            body = {
+                "journal_count": summary["journal_count"],
+                "streak": summary["streak_days"],
+                "recent_journals": summary["recent_journals"],
+            }
+        body["active_missions"] = await home_service._active_missions(user.id)
+        body["new_cards"] = await home_service._new_cards(user.id)
+        return body
+
+
+async def main(args) -> dict:
+    use_sqlite(args.db)
+    from services.api.database import close_db, init_db
+    from services.api.main import app
+
+    await init_db()
+    mount_naive_route(app)
+    async with asgi_client(app) as client:
+        headers = await seed(client, args)
+
+        async def home(c, _i):
+            return await c.get("/home", headers=headers)
+
+        async def server_naive(c, _i):
+            return await c.get("/bench/home-naive", headers=headers)
+
+        async def fan_out(c, _i):
+            responses = await asyncio.gather(
+                c.get("/auth/me", headers=headers),
+                c.get("/journals/?limit=5", headers=headers),
+                c.get("/missions/?limit=20", headers=headers),
+                c.get("/cards/?limit=20", headers=headers),
+            )
+            return max(responses, key=lambda r: r.status_code)
+
+        result = {
+            "benchmark": "home_feed",
+            "journals": args.journals,
+            "concurrency": args.concurrency,
+            "home_summary": await drive(client, home, args.requests, args.concurrency),
+            "client_fan_out": await drive(client, fan_out, args.requests, args.concurrency),
+            "server_recompute": await drive(client, server_naive, args.requests, args.concurrency),
+        }
+    await close_db()
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--db", default=None)
+    parser.add_argument("--journals", type=int, default=3000)
+    parser.add_argument("--missions", type=int, default=30)
+    parser.add_argument("--cards", type=int, default=40)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--out", default=None)
+    args = parser.parse_args()
+    emit(asyncio.run(main(args)), args.out)
@@ -0,0 +1,68 @@
+# bench/metrics_overhead.py
+# 量測 MetricsMiddleware 每個請求的額外開銷（不含網路與 framework），超過上限時以非 0 結束
+#
+#   python -m bench.metrics_overhead --iterations 200000 --max-overhead-us 15
+import argparse
+import asyncio
+import sys
+import time
+
+from bench._common import emit
+
+
+async def bare_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/json")]})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def _noop_send(message):
+    pass
+
+
+async def _receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def measure(app, iterations: int) -> float:
+    scope = {"type": "http", "method": "GET", "path": "/health/ping", "headers": [], "query_string": b""}
+    for _ in range(1000):  # warm-up
+        await app(dict(scope), _receive, _noop_send)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await app(dict(scope), _receive, _noop_send)
+    return (time.perf_counter() - start) / iterations
+
+
+async def main(args) -> dict:
+    from services.api.metrics import MetricsMiddleware, MetricsRegistry, StackSampler
+
+    wrapped = MetricsMiddleware(bare_app, registry=MetricsRegistry())
+    # sample_rate=0：profiler 已啟用但這個請求沒被抽中，量的是常態路徑的成本
+    sampled = MetricsMiddleware(bare_app, registry=MetricsRegistry(), sampler=StackSampler(5, sample_rate=0.0))
+
+    base = min([await measure(bare_app, args.iterations) for _ in range(args.rounds)])
+    with_metrics = min([await measure(wrapped, args.iterations) for _ in range(args.rounds)])
+    with_sampler = min([await measure(sampled, args.iterations) for _ in range(args.rounds)])
+    overhead_us = (with_metrics - base) * 1e6
+    return {
+        "benchmark": "metrics_overhead",
+        "iterations": args.iterations,
+        "bare_us": round(base * 1e6, 3),
+        "metrics_us": round(with_metrics * 1e6, 3),
+        "metrics_with_idle_sampler_us": round(with_sampler * 1e6, 3),
+        "overhead_us": round(overhead_us, 3),
+        "max_overhead_us": args.max_overhead_us,
+        "ok": overhead_us <= args.max_overhead_us,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=100_000)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--max-overhead-us", type=float, default=15.0)
+    parser.add_argument("--out", default=None)
+    args = parser.parse_args()
+    result = asyncio.run(main(args))
+    emit(result, args.out)
+    sys.exit(0 if result["ok"] else 1)
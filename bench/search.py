@@ -0,0 +1,187 @@
+# bench/search.py
+# /journals/search 的查詢延遲：在 N 筆（預設 1,000,000）合成日記上，比較索引搜尋
+# （SQLite FTS5 二連組 + bm25，search_service.search_journals）與不走索引的 LIKE '%q%' 掃描。
+# 詞長分成三字以上、兩字、單字三組，兩字詞是中文最常見的查詢。
+#
+# 使用者的日記量刻意不平均：heavy 使用者擁有 --heavy-share 比例的日記，其餘平均分給 --users 位，
+# 分別量測「一般使用者」與「大量使用者」兩種情境。種子資料寫入時走 journals 的 trigger，
+# 與正式寫入路徑維護索引的方式相同；--db 指定既有檔案且筆數相符時直接沿用，不重建。
+#
+#   python -m bench.search --entries 1000000 --queries 50 --db /tmp/jq-search.db
+import argparse
+import asyncio
+import os
+import random
+import time
+from datetime import timedelta
+
+from bench._common import emit, summarize, use_sqlite
+
+SEED_BATCH = 20_000
+COMMON_WORDS = [
+    "今天", "心情", "天氣", "朋友", "工作", "家人", "散步", "拜拜", "吃飯", "讀書", "下雨", "開心",
+    "龍山寺", "媽祖廟", "行天宮", "夜市", "平安符", "求籤", "點光明燈", "土地公", "香油錢", "還願",
+]
+RARE_CHARS = "福祿壽喜財吉祥安康順利和平光明清淨慈悲智慧圓滿如意長春永興隆昌盛德善"
+# 真正少見的詞：每篇有 1% 機率夾帶一個，每個詞在全部資料裡只出現個位數次
+NEEDLE_CHARS = "甲乙丙丁戊己庚辛壬癸子丑寅卯辰巳午未申酉戌亥"
+NEEDLES = 2000
+
+
+def _vocabulary(rng: random.Random) -> tuple[list[str], list[float], list[str]]:
+    # 常用詞在前、隨機組成的三字詞在後；Zipf 權重讓後段的出現頻率遞減
+    tail = sorted({"".join(rng.choices(RARE_CHARS, k=3)) for _ in range(2000)})[:600]
+    words = COMMON_WORDS + tail
+    weights = [1 / (rank + 1) for rank in range(len(words))]
+    needles = sorted({"".join(rng.choices(NEEDLE_CHARS, k=4)) for _ in range(NEEDLES * 2)})[:NEEDLES]
+    return words, weights, needles
+
+
+def _seed(path: str, args, words: list[str], weights: list[float], needles: list[str]) -> float:
+    from sqlalchemy import create_engine, func, insert, select
+
+    from services.api.database import Base, register_sqlite_functions, utcnow
+    from services.api.models import Journal, JournalTag, User
+
+    engine = create_engine(f"sqlite:///{path}")
+    # journals 的 FTS trigger 會呼叫 jq_search_tokens()
+    register_sqlite_functions(engine)
+    with engine.begin() as conn:
+        Base.metadata.create_all(conn)
+        if conn.scalar(select(func.count()).select_from(Journal)) == args.entries:
+            return 0.0
+
+    rng = random.Random(args.seed)
+    tags = ["廟宇", "旅行", "家庭", "工作", "心情", "祈福", "美食", "閱讀"]
+    heavy = int(args.entries * args.heavy_share)
+    now = utcnow()
+    start = time.perf_counter()
+    with engine.begin() as conn:
+        conn.exec_driver_sql("PRAGMA synchronous=OFF")
+        users = [{"id": i, "email": f"user{i}@bench.local", "password_hash": ""} for i in range(1, args.users + 2)]
+        conn.execute(insert(User), users)
+        next_id = 1
+        while next_id <= args.entries:
+            journals, journal_tags = [], []
+            for journal_id in range(next_id, min(next_id + SEED_BATCH, args.entries + 1)):
+                # user 1 是 heavy 使用者，其餘平均分散
+                user_id = 1 if journal_id <= heavy else 2 + journal_id % args.users
+                picked = rng.sample(tags, rng.randint(0, 2))
+                content = rng.choices(words, weights, k=rng.randint(15, 30))
+                if rng.random() < 0.01:
+                    content.append(rng.choice(needles))
+                journals.append(
+                    {
+                        "id": journal_id,
+                        "user_id": user_id,
+                        "title": "".join(rng.choices(words, weights, k=3)),
+                        "content": "，".join(content),
+                        "tags": picked,
+                        "created_at": now - timedelta(minutes=journal_id),
+                    }
+                )
+                journal_tags.extend({"journal_id": journal_id, "user_id": user_id, "tag": t} for t in picked)
+            conn.execute(insert(Journal), journals)
+            if journal_tags:
+                conn.execute(insert(JournalTag), journal_tags)
+            next_id += SEED_BATCH
+    engine.dispose()
+    return time.perf_counter() - start
+
+
+def _queries(rng: random.Random, words: list[str], needles: list[str], n: int) -> dict[str, list]:
+    long_common = [w for w in COMMON_WORDS if len(w) >= 3]
+    short_common = [w for w in COMMON_WORDS if len(w) < 3]
+    return {
+        "common_term": [(rng.choice(long_common), []) for _ in range(n)],
+        "tail_term": [(rng.choice(words[len(COMMON_WORDS) + 100 :]), []) for _ in range(n)],
+        "rare_term": [(rng.choice(needles), []) for _ in range(n)],
+        "two_terms": [(" ".join(rng.sample(long_common, 2)), []) for _ in range(n)],
+        "short_term": [(rng.choice(short_common), []) for _ in range(n)],
+        "single_char": [(rng.choice(RARE_CHARS), []) for _ in range(n)],
+        "tag_only": [("", [rng.choice(["廟宇", "旅行", "祈福"])]) for _ in range(n)],
+        "term_and_tag": [(rng.choice(long_common), ["廟宇"]) for _ in range(n)],
+    }
+
+
+async def _measure(args, words: list[str], needles: list[str]) -> dict:
+    from sqlalchemy import case, or_, select
+
+    from services.api.database import SessionLocal, close_db
+    from services.api.models import Journal
+    from services.api.pagination import PageParams
+    from services.api.services import search_service
+
+    rng = random.Random(args.seed + 1)
+    page = PageParams(cursor=None, limit=20)
+
+    async def naive(db, user_id: int, q: str) -> list:
+        # 不用索引的對照組：逐筆 LIKE，標題命中排前面（要排序就得先找出該使用者的所有命中）
+        terms = search_service.parse_terms(q)
+        stmt = select(Journal).where(Journal.user_id == user_id)
+        for term in terms:
+            stmt = stmt.where(or_(Journal.title.like(f"%{term}%"), Journal.content.like(f"%{term}%")))
+        title_hit = case((Journal.title.like(f"%{terms[0]}%"), 1), else_=0)
+        stmt = stmt.order_by(title_hit.desc(), Journal.id.desc()).limit(page.limit + 1)
+        return list((await db.scalars(stmt)).all())
+
+    async def run(user_for, queries, fn) -> dict:
+        latencies = []
+        start = time.perf_counter()
+        async with SessionLocal() as db:
+            for q, tags in queries:
+                t0 = time.perf_counter()
+                await fn(db, user_for(), q, tags)
+                latencies.append(time.perf_counter() - t0)
+        return summarize(latencies, time.perf_counter() - start)
+
+    async def indexed(db, user_id, q, tags):
+        return await search_service.search_journals(db, user_id, q, tags, page)
+
+    async def next_page(db, user_id, q, tags):
+        _, cursor = await search_service.search_journals(db, user_id, q, tags, page)
+        if cursor:
+            await search_service.search_journals(db, user_id, q, tags, PageParams(cursor=cursor, limit=page.limit))
+
+    users = {"typical": lambda: 2 + rng.randrange(args.users), "heavy": lambda: 1}
+    result: dict = {}
+    for scope, user_for in users.items():
+        queries = _queries(rng, words, needles, args.queries)
+        scope_result = {kind: await run(user_for, qs, indexed) for kind, qs in queries.items()}
+        scope_result["common_term_page2"] = await run(user_for, queries["common_term"], next_page)
+        for kind in ("common_term", "tail_term", "rare_term", "short_term", "single_char"):
+            scope_result[f"{kind}_like_scan"] = await run(
+                user_for, queries[kind], lambda db, u, q, tags: naive(db, u, q)
+            )
+        result[scope] = scope_result
+    await close_db()
+    return result
+
+
+def main(args) -> dict:
+    path = use_sqlite(args.db)
+    words, weights, needles = _vocabulary(random.Random(args.seed))
+    seed_s = _seed(path, args, words, weights, needles)
+    result = {
+        "benchmark": "search",
+        "entries": args.entries,
+        "users": args.users,
+        "heavy_user_entries": int(args.entries * args.heavy_share),
+        "seed_s": round(seed_s, 1),
+        "db_bytes": os.path.getsize(path),
+    }
+    result.update(asyncio.run(_measure(args, words, needles)))
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--entries", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--heavy-share", type=float, default=0.1)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--db", default=None, help="SQLite 檔案路徑；筆數相符時沿用既有資料")
+    parser.add_argument("--out", default=None)
+    args = parser.parse_args()
+    emit(main(args), args.out)
@@ -0,0 +1,118 @@
+# bench/serialization.py
+# 1,000 筆日記列表的序列化成本：
+#   - dict_jsonable：改版前的寫法，每筆先複製成 dict，再走 jsonable_encoder + json.dumps
+#   - dict_orjson：同樣複製成 dict，但交給 ORJSONResponse
+#   - pydantic：ORM rows 以 TypeAdapter(CursorPage[JournalOut]) from_attributes 驗證後 dump_json
+#   - page_response：ORM rows 直接交給 orjson，由 default hook 逐筆依 JournalOut 欄位從 __dict__ 組出 dict
+#
+#   python -m bench.serialization --items 1000 --rounds 200
+import argparse
+import json
+import time
+from datetime import timedelta
+
+from bench._common import emit, percentile, use_sqlite
+
+
+def _rows(n: int):
+    from services.api.database import utcnow
+    from services.api.models.journal import Journal
+
+    now = utcnow()
+    return [
+        Journal(
+            id=i,
+            user_id=1,
+            client_id=f"client-{i}",
+            title=f"日記 {i}",
+            content="今天去了廟裡拜拜，心情平靜。" * 8,
+            tags=["廟宇", "祈福"] if i % 4 == 0 else [],
+            created_at=now - timedelta(minutes=i),
+        )
+        for i in range(n)
+    ]
+
+
+def _time(fn, rounds: int) -> dict:
+    samples = []
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return {
+        "mean_ms": round(sum(samples) / len(samples) * 1000, 3),
+        "p50_ms": round(percentile(samples, 50) * 1000, 3),
+        "p95_ms": round(percentile(samples, 95) * 1000, 3),
+    }
+
+
+def main(args) -> dict:
+    use_sqlite()
+    from fastapi.encoders import jsonable_encoder
+
+    from pydantic import TypeAdapter
+
+    from services.api.responses import ORJSONResponse, page_response
+    from services.api.schemas.common import CursorPage
+    from services.api.schemas.journal import JournalOut
+
+    rows = _rows(args.items)
+    cursor = "bench-cursor"
+
+    def as_dicts():
+        return {
+            "items": [
+                {
+                    "id": j.id,
+                    "user_id": j.user_id,
+                    "client_id": j.client_id,
+                    "title": j.title,
+                    "content": j.content,
+                    "tags": j.tags,
+                    "created_at": j.created_at,
+                }
+                for j in rows
+            ],
+            "next_cursor": cursor,
+        }
+
+    def dict_jsonable():
+        return json.dumps(jsonable_encoder(as_dicts()), ensure_ascii=False).encode()
+
+    def dict_orjson():
+        return ORJSONResponse(as_dicts()).body
+
+    adapter = TypeAdapter(CursorPage[JournalOut])
+
+    def pydantic_dump():
+        page = {"items": rows, "next_cursor": cursor}
+        return adapter.dump_json(adapter.validate_python(page, from_attributes=True))
+
+    def direct():
+        return page_response(JournalOut, rows, cursor).body
+
+    # 各種寫法輸出的內容必須等價（包含 datetime 格式）
+    assert json.loads(pydantic_dump()) == json.loads(direct()) == json.loads(dict_orjson())
+    for fn in (dict_jsonable, dict_orjson, pydantic_dump, direct):
+        fn()  # warm-up（TypeAdapter 建立等）
+
+    result = {
+        "benchmark": "serialization",
+        "items": args.items,
+        "payload_bytes": len(direct()),
+        "dict_jsonable": _time(dict_jsonable, args.rounds),
+        "dict_orjson": _time(dict_orjson, args.rounds),
+        "pydantic": _time(pydantic_dump, args.rounds),
+        "page_response": _time(direct, args.rounds),
+    }
+    result["speedup_vs_jsonable"] = round(result["dict_jsonable"]["mean_ms"] / result["page_response"]["mean_ms"], 1)
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--out", default=None)
+    args = parser.parse_args()
+    emit(main(args), args.out)
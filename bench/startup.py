@@ -0,0 +1,77 @@
+# bench/startup.py
+# cold-start：每次開一個新的 Python 進程 import services.api.main，量 import 本身的耗時
+# （不含直譯器啟動），另外記錄整個進程的 wall time。--importtime 會附上 -X importtime 累計最久的模組。
+#
+#   python -m bench.startup --runs 10 --importtime 15
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any
+
+from bench._common import ROOT, emit
+
+_PROBE = "import time; t0 = time.perf_counter(); import services.api.main; print(time.perf_counter() - t0)"
+
+
+def _env() -> dict[str, str]:
+    # 用 SQLite，讓 import 時建立 engine 不需要 asyncpg / 可連線的 PostgreSQL
+    db = os.path.join(tempfile.mkdtemp(prefix="jq-bench-"), "startup.db")
+    return dict(os.environ, PYTHONPATH=str(ROOT), DATABASE_URL=f"sqlite+aiosqlite:///{db}")
+
+
+def measure(runs: int) -> dict[str, Any]:
+    env = _env()
+    imports, walls = [], []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        out = subprocess.run(
+            [sys.executable, "-c", _PROBE], cwd=ROOT, env=env, capture_output=True, text=True, check=True
+        )
+        walls.append(time.perf_counter() - t0)
+        imports.append(float(out.stdout.strip().splitlines()[-1]))
+    return {
+        "runs": runs,
+        "import_min_ms": round(min(imports) * 1000, 1),
+        "import_p50_ms": round(statistics.median(imports) * 1000, 1),
+        "process_p50_ms": round(statistics.median(walls) * 1000, 1),
+    }
+
+
+def slowest_imports(top: int) -> list[dict[str, Any]]:
+    """-X importtime 輸出中 cumulative 最久的 top 個模組。"""
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import services.api.main"],
+        cwd=ROOT,
+        env=_env(),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = []
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        # 格式："import time:   self_us |   cumulative_us | [縮排]module"
+        self_us, cumulative_us, name = (field.strip() for field in line[len("import time:") :].split("|"))
+        rows.append({"module": name, "self_us": int(self_us), "cumulative_us": int(cumulative_us)})
+    return sorted(rows, key=lambda r: r["cumulative_us"], reverse=True)[:top]
+
+
+def main(args) -> dict[str, Any]:
+    result = {"benchmark": "startup", **measure(args.runs)}
+    if args.importtime:
+        result["slowest_imports"] = slowest_imports(args.importtime)
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--importtime", type=int, default=0, help="列出 cumulative 最久的 N 個模組")
+    parser.add_argument("--out", default=None)
+    args = parser.parse_args()
+    emit(main(args), args.out)
@@ -0,0 +1,69 @@
+# bench/suite.py
+# 一次跑完 startup 與各 router 的 load 測試（asgi；未加 --skip-uvicorn 時也跑 uvicorn），寫成單一 JSON。
+# 帶 --baseline 時與先前的結果比較（bench.compare），有退步就以非 0 結束，改動 main.py、database.py
+# 或 router 前後各跑一次即可比對。
+#
+#   python -m bench.suite --out bench-baseline.json
+#   python -m bench.suite --out bench-current.json --baseline bench-baseline.json --tolerance 0.15
+import argparse
+import asyncio
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from bench import compare, load, startup
+from bench._common import ROOT, emit
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True)
+    except OSError:
+        return None
+    return out.stdout.strip() or None
+
+
+def meta(args) -> dict[str, Any]:
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "database": "custom" if args.database_url else "sqlite",
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+    }
+
+
+def main(args) -> int:
+    result: dict[str, Any] = {"benchmark": "suite", "meta": meta(args)}
+    # 先量 cold-start，避免受到後面壓測殘留的系統負載影響
+    result["startup"] = startup.measure(args.runs)
+    result["asgi"] = asyncio.run(load.run_asgi(args))
+    if not args.skip_uvicorn:
+        result["uvicorn"] = asyncio.run(load.run_uvicorn(args))
+
+    status = 0
+    if args.baseline:
+        comparison = compare.compare(compare.load(args.baseline), result, args.tolerance, args.min_delta_ms)
+        result["comparison"] = comparison
+        print(compare.report(comparison), file=sys.stderr)
+        status = 1 if comparison["regressions"] else 0
+    emit(result, args.out)
+    return status
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    load.add_arguments(parser)
+    parser.add_argument("--runs", type=int, default=10, help="cold-start 量測次數")
+    parser.add_argument("--skip-uvicorn", action="store_true")
+    parser.add_argument("--baseline", default=None, help="先前的 suite 輸出，用來判斷退步")
+    parser.add_argument("--tolerance", type=float, default=0.1)
+    parser.add_argument("--min-delta-ms", type=float, default=0.5)
+    parser.add_argument("--out", default=None)
+    sys.exit(main(parser.parse_args()))
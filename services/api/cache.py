@@ -0,0 +1,354 @@
+# services/api/cache.py
+# 讀多寫少路由（/cards、/missions）的伺服器端回應快取
+#
+# - 以純 ASGI middleware 掛在 main.py，不經過 handler 就能回應命中的請求
+# - key = path + 排序後 query；只用於不依使用者而異的公開 GET 路由，所有請求共用同一份快取
+# - 回應帶強 ETag（body 的 sha256），If-None-Match 相符時回 304
+# - 每筆快取帶 tag（例如 "cards"），寫入路由呼叫 invalidate_tags() 使其失效；每個 tag 另有世代計數，
+#   失效時 +1，請求開始後世代有變（讀到的可能是寫入前的資料）就不寫入快取
+# - 預設 in-process LRU（TTL + 筆數/位元組上限）；設定 CACHE_REDIS_URL 時改用 Redis。
+#   LRU 的失效只作用在處理寫入的那個 worker，多 worker 部署必須設定 CACHE_REDIS_URL
+import base64
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Optional, Protocol
+from urllib.parse import parse_qsl, urlencode
+
+from services.api.config import Settings, settings
+
+
+@dataclass
+class CacheEntry:
+    status: int
+    headers: list[tuple[bytes, bytes]]
+    body: bytes
+    etag: str
+    tags: tuple[str, ...] = ()
+    # 產生這筆回應的路由樣板，命中時寫回 scope["route_path"] 供 metrics 標記
+    route: str = ""
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+    not_modified: int = 0
+    entries: int = 0
+    bytes: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+class CacheBackend(Protocol):
+    stats: CacheStats
+
+    async def get(self, key: str) -> Optional[CacheEntry]: ...
+
+    async def set(self, key: str, entry: CacheEntry) -> None: ...
+
+    async def invalidate_tags(self, *tags: str) -> int: ...
+
+    async def generation(self, tag: str) -> int: ...
+
+    async def clear(self) -> None: ...
+
+
+class LRUCache:
+    """進程內 LRU；超過 TTL 的項目在讀取時丟棄，超過筆數或位元組上限時從最舊的開始淘汰。"""
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 16 * 1024 * 1024, ttl: float = 60.0):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._data: "OrderedDict[str, tuple[float, CacheEntry]]" = OrderedDict()
+        self._tags: dict[str, set[str]] = {}
+        self._generations: dict[str, int] = {}
+
+    async def get(self, key: str) -> Optional[CacheEntry]:
+        item = self._data.get(key)
+        if item is None:
+            self.stats.misses += 1
+            return None
+        expires_at, entry = item
+        if expires_at < time.monotonic():
+            self._remove(key)
+            self.stats.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.stats.hits += 1
+        return entry
+
+    async def set(self, key: str, entry: CacheEntry) -> None:
+        if len(entry.body) > self.max_bytes:
+            return
+        if key in self._data:
+            self._remove(key)
+        self._data[key] = (time.monotonic() + self.ttl, entry)
+        self.stats.bytes += len(entry.body)
+        for tag in entry.tags:
+            self._tags.setdefault(tag, set()).add(key)
+        while len(self._data) > self.max_entries or self.stats.bytes > self.max_bytes:
+            oldest = next(iter(self._data))
+            self._remove(oldest)
+            self.stats.evictions += 1
+        self.stats.entries = len(self._data)
+
+    async def invalidate_tags(self, *tags: str) -> int:
+        removed = 0
+        for tag in tags:
+            self._generations[tag] = self._generations.get(tag, 0) + 1
+            for key in self._tags.pop(tag, set()):
+                if key in self._data:
+                    self._remove(key)
+                    removed += 1
+        self.stats.invalidations += removed
+        return removed
+
+    async def generation(self, tag: str) -> int:
+        return self._generations.get(tag, 0)
+
+    async def clear(self) -> None:
+        self._data.clear()
+        self._tags.clear()
+        self.stats.entries = self.stats.bytes = 0
+
+    def _remove(self, key: str) -> None:
+        _, entry = self._data.pop(key)
+        self.stats.bytes -= len(entry.body)
+        self.stats.entries = len(self._data)
+        for tag in entry.tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+class RedisCache:
+    """Redis 相容後端；client 需提供 redis.asyncio 的 get/set/delete/incr/scan_iter 與
+    zadd/zrange/zremrangebyscore/pexpire。
+
+    tag 索引是 sorted set（member = key，score = 該筆的到期時間），每次寫入順便刪掉已過期的
+    member 並延長整個 set 的 TTL，不再有寫入的 tag 會自行消失，不會無限成長。
+    測試時可傳入 fakeredis.aioredis.FakeRedis 或 tests/test_cache.py 的 FakeRedis。
+    淘汰由 Redis 自己的 TTL / maxmemory 處理，所以 evictions 不會在這裡計數。
+    """
+
+    def __init__(self, client: Any, ttl: float = 60.0, prefix: str = "jq:cache:"):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+        self.stats = CacheStats()
+
+    async def get(self, key: str) -> Optional[CacheEntry]:
+        raw = await self.client.get(self.prefix + key)
+        if raw is None:
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        data = json.loads(raw)
+        return CacheEntry(
+            status=data["status"],
+            headers=[(k.encode("latin-1"), v.encode("latin-1")) for k, v in data["headers"]],
+            body=base64.b64decode(data["body"]),
+            etag=data["etag"],
+            tags=tuple(data["tags"]),
+            route=data.get("route", ""),
+        )
+
+    async def set(self, key: str, entry: CacheEntry) -> None:
+        payload = json.dumps(
+            {
+                "status": entry.status,
+                "headers": [(k.decode("latin-1"), v.decode("latin-1")) for k, v in entry.headers],
+                "body": base64.b64encode(entry.body).decode(),
+                "etag": entry.etag,
+                "tags": list(entry.tags),
+                "route": entry.route,
+            }
+        )
+        ttl_ms = int(self.ttl * 1000)
+        await self.client.set(self.prefix + key, payload, px=ttl_ms)
+        # score 用牆上時間，多個 worker 共用同一個 Redis 時才有一致的基準
+        now = time.time()
+        for tag in entry.tags:
+            tag_key = self._tag_key(tag)
+            await self.client.zadd(tag_key, {key: now + self.ttl})
+            await self.client.zremrangebyscore(tag_key, "-inf", now)
+            await self.client.pexpire(tag_key, ttl_ms)
+
+    async def invalidate_tags(self, *tags: str) -> int:
+        removed = 0
+        for tag in tags:
+            # 先推進世代，之後才開始的快取寫入都會被擋下
+            await self.client.incr(self._generation_key(tag))
+            keys = await self.client.zrange(self._tag_key(tag), 0, -1)
+            names = [self.prefix + (k.decode() if isinstance(k, bytes) else k) for k in keys]
+            if names:
+                removed += await self.client.delete(*names)
+            await self.client.delete(self._tag_key(tag))
+        self.stats.invalidations += removed
+        return removed
+
+    async def clear(self) -> None:
+        # 只清自己 prefix 底下的 key，不動同一個 Redis 裡的其他資料
+        async for name in self.client.scan_iter(match=self.prefix + "*"):
+            await self.client.delete(name)
+
+    async def generation(self, tag: str) -> int:
+        raw = await self.client.get(self._generation_key(tag))
+        return int(raw) if raw is not None else 0
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.prefix}tag:{tag}"
+
+    def _generation_key(self, tag: str) -> str:
+        # 不設 TTL：tag 數量固定（main.py 的 rules），過期重置反而可能讓舊世代的寫入通過
+        return f"{self.prefix}gen:{tag}"
+
+
+def build_cache(cfg: Settings = settings) -> CacheBackend:
+    if cfg.cache_redis_url:
+        try:
+            import redis.asyncio as aioredis
+        except ImportError as exc:  # pragma: no cover - 只在有設定 Redis 時才需要
+            raise RuntimeError("CACHE_REDIS_URL is set but the 'redis' package is not installed") from exc
+        return RedisCache(aioredis.from_url(cfg.cache_redis_url), ttl=cfg.cache_ttl)
+    return LRUCache(max_entries=cfg.cache_max_entries, max_bytes=cfg.cache_max_bytes, ttl=cfg.cache_ttl)
+
+
+response_cache: CacheBackend = build_cache()
+
+# 快取 key 的範圍；目前只快取公開回應，全部共用一個
+PUBLIC_SCOPE = "public"
+
+
+def _header(scope: dict, name: bytes) -> Optional[bytes]:
+    for k, v in scope["headers"]:
+        if k == name:
+            return v
+    return None
+
+
+def _etag_matches(if_none_match: Optional[bytes], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [c.strip() for c in if_none_match.decode("latin-1").split(",")]
+    return "*" in candidates or etag in candidates
+
+
+class ResponseCacheMiddleware:
+    """rules 把 path 前綴對應到 tag，例如 {"/cards": "cards"}；只快取 GET 的 200 JSON 回應。
+
+    快取不分使用者，rules 只能列回應與身分無關的公開路由。
+    """
+
+    def __init__(self, app: Any, rules: dict[str, str], cache: Optional[CacheBackend] = None):
+        self.app = app
+        self.rules = sorted(rules.items(), key=lambda kv: len(kv[0]), reverse=True)
+        self.cache = cache if cache is not None else response_cache
+
+    def _tag_for(self, path: str) -> Optional[str]:
+        for prefix, tag in self.rules:
+            if path == prefix or path.startswith(prefix + "/"):
+                return tag
+        return None
+
+    @staticmethod
+    def cache_key(scope: dict) -> str:
+        query = urlencode(sorted(parse_qsl(scope.get("query_string", b"").decode("latin-1"), keep_blank_values=True)))
+        # 不把 Authorization 放進 key：每個 token 各佔一筆只會讓項目數無上限成長，回應內容也不會不同
+        raw = f"{scope['path']}?{query}|{PUBLIC_SCOPE}"
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    async def __call__(self, scope: dict, receive: Any, send: Any) -> None:
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+        tag = self._tag_for(scope["path"])
+        if tag is None:
+            await self.app(scope, receive, send)
+            return
+
+        key = self.cache_key(scope)
+        if_none_match = _header(scope, b"if-none-match")
+        entry = await self.cache.get(key)
+        if entry is not None:
+            scope["route_path"] = entry.route
+            await self._replay(entry, if_none_match, send)
+            return
+        # handler 讀資料之前先記下世代；回應產生期間若有寫入並 invalidate，這份結果可能是舊的
+        generation = await self.cache.generation(tag)
+
+        start: dict = {}
+        chunks: list[bytes] = []
+        passthrough = False
+
+        async def capture(message: dict) -> None:
+            nonlocal passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                headers = dict(message.get("headers", []))
+                content_type = headers.get(b"content-type", b"")
+                # 非 200 或非 JSON（例如 /export 的 NDJSON 串流）直接放行，不緩衝
+                if message["status"] != 200 or not content_type.startswith(b"application/json"):
+                    passthrough = True
+                    await send(message)
+                    return
+                start.update(message)
+                return
+            chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+            body = b"".join(chunks)
+            etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+            headers = [(k, v) for k, v in start.get("headers", []) if k != b"etag"]
+            headers.append((b"etag", etag.encode()))
+            route = getattr(scope.get("route"), "path", "")
+            entry = CacheEntry(
+                status=start["status"], headers=headers, body=body, etag=etag, tags=(tag,), route=route
+            )
+            if await self.cache.generation(tag) == generation:
+                await self.cache.set(key, entry)
+                # Redis 的檢查與寫入之間還隔著網路往返，寫完再確認一次；被失效追上就整個 tag 再清一次
+                if await self.cache.generation(tag) != generation:
+                    await self.cache.invalidate_tags(tag)
+            await self._replay(entry, if_none_match, send)
+
+        await self.app(scope, receive, capture)
+
+    async def _replay(self, entry: CacheEntry, if_none_match: Optional[bytes], send: Any) -> None:
+        if _etag_matches(if_none_match, entry.etag):
+            self.cache.stats.not_modified += 1
+            headers = [(k, v) for k, v in entry.headers if k in (b"etag", b"cache-control", b"vary")]
+            await send({"type": "http.response.start", "status": 304, "headers": headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+        await send({"type": "http.response.start", "status": entry.status, "headers": entry.headers})
+        await send({"type": "http.response.body", "body": entry.body})
+
+
+def prometheus_lines(cache: Optional[CacheBackend] = None) -> list[str]:
+    stats = (cache if cache is not None else response_cache).stats
+    lines = []
+    for name in ("hits", "misses", "evictions", "invalidations", "not_modified"):
+        lines.append(f"# TYPE response_cache_{name}_total counter")
+        lines.append(f"response_cache_{name}_total {getattr(stats, name)}")
+    for name in ("entries", "bytes"):
+        lines.append(f"# TYPE response_cache_{name} gauge")
+        lines.append(f"response_cache_{name} {getattr(stats, name)}")
+    return lines
+
+
+async def invalidate(*tags: str) -> int:
+    """寫入路由在 commit 之後呼叫，例如 await invalidate("cards")。"""
+    return await response_cache.invalidate_tags(*tags)
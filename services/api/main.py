@@ -1,20 +1,64 @@
 # services/api/main.py
+import asyncio
+from contextlib import asynccontextmanager, suppress
+
 from fastapi import FastAPI
+from fastapi.datastructures import Default
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import RedirectResponse
 
+from services.api import metrics
+from services.api.cache import ResponseCacheMiddleware, prometheus_lines
+from services.api.config import settings
+from services.api.database import close_db, engine, init_db
+from services.api.responses import ORJSONResponse
+from services.api.services.auth_service import revocation_sync_loop, sync_revocations
+from services.api.services.home_service import summary_refresh_loop
+
 # Routers
+from services.api.routes.auth_routes import router as auth_router
 from services.api.routes.health_router import router as health_router
 from services.api.routes.user_router import router as user_router
 from services.api.routes.journal_router import router as journal_router
 from services.api.routes.mission_router import router as mission_router
 from services.api.routes.card_router import router as card_router
+from services.api.routes.home_router import router as home_router
+from services.api.routes.metrics_router import router as metrics_router
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.db_create_all:
+        await init_db()
+    # 撤銷清單啟動時是空的，先完整載入一次再開始服務，否則已撤銷的 session 在第一輪同步前都會通過
+    await sync_revocations()
+    # 撤銷清單（bloom filter）背景增量同步、首頁摘要定期校正
+    tasks = [asyncio.create_task(revocation_sync_loop())]
+    if settings.home_summary_refresh_interval > 0:
+        tasks.append(asyncio.create_task(summary_refresh_loop()))
+    yield
+    for task in tasks:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    await close_db()
+
 
 app = FastAPI(
     title="JQ Culture API",
     version="1.0.0",
+    lifespan=lifespan,
+    # 沒有 response_model 的回應（dict、錯誤訊息）改走 orjson；包成 Default() 讓有 response_model
+    # 的路由仍保留 FastAPI 直接以 pydantic dump_json 輸出 bytes 的快速路徑
+    default_response_class=Default(ORJSONResponse),
 )
 
+# add_middleware 越晚加的越外層
+# 回應快取：/cards、/missions 讀多寫少，寫入路由會依 tag 失效。
+# 掛在 CORS 內側，快取內容不含 CORS header，命中時仍由 CORSMiddleware 依每個請求的 Origin 補上。
+# 多 worker 部署請設定 CACHE_REDIS_URL（見 config.py），in-process LRU 的失效不會跨 worker
+if settings.cache_enabled:
+    app.add_middleware(ResponseCacheMiddleware, rules={"/cards": "cards", "/missions": "missions"})
+
 # CORS（先全開，正式上線再收斂到你的前端網域）
 app.add_middleware(
     CORSMiddleware,
@@ -23,6 +67,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 指標放最外層，快取命中的請求也會被計時
+if settings.metrics_enabled:
+    metrics.instrument_engine(engine)
+    metrics.registry.collectors.append(prometheus_lines)
+    app.add_middleware(metrics.MetricsMiddleware, sampler=metrics.sampler)
+
 # 根路徑（避免 404；也可改成導向 /docs）
 @app.get("/", include_in_schema=False)
 def index():
@@ -30,7 +80,10 @@ def index():
 
 # 掛載 Routers
 app.include_router(health_router)
+app.include_router(auth_router)
 app.include_router(user_router)
 app.include_router(journal_router)
 app.include_router(mission_router)
 app.include_router(card_router)
+app.include_router(home_router)
+app.include_router(metrics_router)
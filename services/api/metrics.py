@@ -0,0 +1,250 @@
+# services/api/metrics.py
+# 請求層級的指標：每條路由的延遲 / DB 時間 histogram、狀態碼計數、in-flight gauge
+#
+# MetricsMiddleware 是純 ASGI（不用 BaseHTTPMiddleware），每個請求只多做幾次 dict 查找與
+# perf_counter；DB 時間由 SQLAlchemy cursor 事件累加到 contextvar。/metrics 以 Prometheus
+# 文字格式輸出。另有可選的 StackSampler，抽樣記錄最慢 N 個請求的 stack profile。
+import heapq
+import itertools
+import random
+import sys
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from contextvars import ContextVar
+from typing import Any, Callable, Iterable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from services.api.config import Settings, settings
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+UNMATCHED = "<unmatched>"
+
+# 目前請求累計的 DB 時間（秒）；值是 [float] 讓 SQLAlchemy 事件可以原地累加
+_db_time: ContextVar[Optional[list]] = ContextVar("db_time", default=None)
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        # 最後一格是 +Inf；輸出時才轉成 Prometheus 要的累積計數
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> Iterable[tuple[str, int]]:
+        total = 0
+        for bound, n in zip(self.buckets, self.counts):
+            total += n
+            yield repr(bound), total
+        yield "+Inf", total + self.counts[-1]
+
+
+class MetricsRegistry:
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.latency: dict[tuple[str, str], Histogram] = {}
+        self.db_time: dict[tuple[str, str], Histogram] = {}
+        self.responses: Counter = Counter()
+        self.in_flight = 0
+        # render 時額外輸出的 collector，例如回應快取的命中統計
+        self.collectors: list[Callable[[], Iterable[str]]] = []
+
+    def observe(self, method: str, route: str, status: int, seconds: float, db_seconds: float) -> None:
+        key = (method, route)
+        hist = self.latency.get(key)
+        if hist is None:
+            hist = self.latency[key] = Histogram(self.buckets)
+            self.db_time[key] = Histogram(self.buckets)
+        hist.observe(seconds)
+        self.db_time[key].observe(db_seconds)
+        self.responses[(method, route, status)] += 1
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for name, help_text, series in (
+            ("http_request_duration_seconds", "Request latency by route.", self.latency),
+            ("http_request_db_seconds", "Time spent in DB cursor execution per request.", self.db_time),
+        ):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for (method, route), hist in sorted(series.items()):
+                labels = f'method="{method}",route="{_escape(route)}"'
+                for le, n in hist.cumulative():
+                    lines.append(f'{name}_bucket{{{labels},le="{le}"}} {n}')
+                lines.append(f"{name}_sum{{{labels}}} {hist.sum}")
+                lines.append(f"{name}_count{{{labels}}} {hist.count}")
+        lines.append("# HELP http_responses_total Responses by route and status code.")
+        lines.append("# TYPE http_responses_total counter")
+        for (method, route, status), n in sorted(self.responses.items()):
+            lines.append(f'http_responses_total{{method="{method}",route="{_escape(route)}",status="{status}"}} {n}')
+        lines.append("# HELP http_requests_in_flight Requests currently being handled.")
+        lines.append("# TYPE http_requests_in_flight gauge")
+        lines.append(f"http_requests_in_flight {self.in_flight}")
+        for collector in self.collectors:
+            lines.extend(collector())
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+registry = MetricsRegistry()
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """把 cursor 執行時間累加到目前請求的 _db_time。"""
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("_metrics_t0", []).append(time.perf_counter())
+
+    def _stop(conn) -> None:
+        started = conn.info["_metrics_t0"].pop()
+        acc = _db_time.get()
+        if acc is not None:
+            acc[0] += time.perf_counter() - started
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        _stop(conn)
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _error(exception_context):
+        # 執行失敗時不會有 after_cursor_execute；在這裡彈出起始時間，否則每次錯誤都在連線上留下一筆。
+        # 只處理語句執行的錯誤（有 execution_context）；連線建立失敗等沒有對應的 before_cursor_execute
+        conn = exception_context.connection
+        if conn is not None and exception_context.execution_context is not None and conn.info.get("_metrics_t0"):
+            _stop(conn)
+
+
+class StackSampler:
+    """抽樣式 profiler：背景 thread 每 interval 秒抓一次 event loop thread 的 stack。
+
+    同一時間只追蹤一個請求（其餘請求不受影響），請求結束後若屬於最慢的 N 個就保留其
+    folded stacks（可直接餵給 flamegraph.pl / speedscope）。async 並行下同一 thread 上其他
+    task 的 frame 也可能被抽到，解讀時請搭配請求數量。
+    """
+
+    def __init__(self, slowest_n: int, interval: float = 0.005, sample_rate: float = 1.0):
+        self.slowest_n = slowest_n
+        self.interval = interval
+        self.sample_rate = sample_rate
+        self.slowest: list[tuple[float, int, str, Counter]] = []
+        self._active: Optional[Counter] = None
+        self._thread_id: Optional[int] = None
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def begin(self) -> Optional[Counter]:
+        if self._active is not None or random.random() >= self.sample_rate:
+            return None
+        self._thread_id = threading.get_ident()
+        self._active = Counter()
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="jq-stack-sampler", daemon=True)
+            self._thread.start()
+        return self._active
+
+    def end(self, samples: Counter, label: str, seconds: float) -> None:
+        self._active = None
+        if not samples:
+            return
+        item = (seconds, next(self._seq), label, samples)
+        with self._lock:
+            if len(self.slowest) < self.slowest_n:
+                heapq.heappush(self.slowest, item)
+            elif seconds > self.slowest[0][0]:
+                heapq.heapreplace(self.slowest, item)
+
+    def dump(self) -> str:
+        with self._lock:
+            items = sorted(self.slowest, reverse=True)
+        out: list[str] = []
+        for seconds, _, label, samples in items:
+            out.append(f"# {label} {seconds * 1000:.1f}ms samples={sum(samples.values())}")
+            out.extend(f"{stack} {n}" for stack, n in samples.most_common())
+        return "\n".join(out) + "\n"
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            samples = self._active
+            if samples is None:
+                continue
+            frame = sys._current_frames().get(self._thread_id)
+            stack: list[str] = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({code.co_filename}:{frame.f_lineno})")
+                frame = frame.f_back
+            if stack:
+                samples[";".join(reversed(stack))] += 1
+
+
+def build_sampler(cfg: Settings = settings) -> Optional[StackSampler]:
+    if cfg.profile_slowest <= 0:
+        return None
+    return StackSampler(cfg.profile_slowest, cfg.profile_interval_ms / 1000, cfg.profile_sample_rate)
+
+
+sampler: Optional[StackSampler] = build_sampler()
+
+
+class MetricsMiddleware:
+    def __init__(self, app: Any, registry: MetricsRegistry = registry, sampler: Optional[StackSampler] = None):
+        self.app = app
+        self.registry = registry
+        self.sampler = sampler
+
+    async def __call__(self, scope: dict, receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        db_acc = [0.0]
+        token = _db_time.set(db_acc)
+        samples = self.sampler.begin() if self.sampler is not None else None
+
+        async def send_wrapper(message: dict) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        reg = self.registry
+        reg.in_flight += 1
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            reg.in_flight -= 1
+            _db_time.reset(token)
+            label = self._route_label(scope)
+            reg.observe(scope["method"], label, status, elapsed, db_acc[0])
+            if samples is not None:
+                self.sampler.end(samples, f"{scope['method']} {label}", elapsed)
+
+    @staticmethod
+    def _route_label(scope: dict) -> str:
+        # 用路由樣板（/journals/{id}）而不是實際 path，避免 label 基數爆炸；
+        # 被回應快取直接擋下的請求不會經過 router，改用快取寫入的 route_path
+        route = scope.get("route")
+        if route is not None:
+            return getattr(route, "path", UNMATCHED)
+        return scope.get("route_path", UNMATCHED)
@@ -1,2 +1,13 @@
 # 讓 models 可被 import
 # 讓 schemas 可被 import
+from services.api.models.card import Card
+from services.api.models.journal import Journal
+from services.api.models.journal_tag import JournalTag
+from services.api.models.mission import Mission
+from services.api.models.mission_progress import MissionProgress
+from services.api.models.tokens import RefreshToken
+from services.api.models.user import User
+from services.api.models.user_card import UserCard
+from services.api.models.user_summary import UserSummary
+
+__all__ = ["Card", "Journal", "JournalTag", "Mission", "MissionProgress", "RefreshToken", "User", "UserCard", "UserSummary"]
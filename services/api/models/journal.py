@@ -0,0 +1,119 @@
+import logging
+import re
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import DDL, JSON, Connection, ForeignKey, Index, Integer, String, Text, UniqueConstraint, event, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Mapped, mapped_column
+
+from services.api.database import SQLITE_FUNCTIONS, Base, UTCDateTime, utcnow
+
+
+class Journal(Base):
+    __tablename__ = "journals"
+    # 列表依 (created_at, id) 倒序做 keyset 分頁，索引欄位順序需與 ORDER BY 一致
+    __table_args__ = (
+        Index("ix_journals_user_created_id", "user_id", "created_at", "id"),
+        # 離線同步用 client 端產生的 id 做 upsert，重送同一批不會產生重複日記
+        UniqueConstraint("user_id", "client_id", name="uq_journals_user_client"),
+        # 全文搜尋（search_service）：PostgreSQL 走下方的 pg_bigm / pg_trgm GIN 索引，SQLite 走 FTS5 表
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
+    client_id: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    title: Mapped[str] = mapped_column(String(200), default="")
+    content: Mapped[str] = mapped_column(Text, default="")
+    # 顯示用的標籤清單；篩選走 journal_tags 表（JournalTag）
+    tags: Mapped[list[str]] = mapped_column(JSON, default=list)
+    created_at: Mapped[datetime] = mapped_column(UTCDateTime, default=utcnow)
+
+
+# 全文搜尋以「字元二連組」建索引：中文常見的兩字詞（拜拜、心情）也能走索引，一個字的查詢則用前綴比對
+#
+# PostgreSQL：pg_bigm（需另外安裝，官方映像與多數代管服務預設沒有），對 lower(title) / lower(content)
+# 建 GIN 索引，查詢用 lower(col) LIKE '%詞%'。沒有 pg_bigm 時退回 contrib 的 pg_trgm（三連組，
+# 一、兩個字的詞無法走索引）；兩者都沒有就只能全表 LIKE。由 database.init_db() 在每次啟動時呼叫，
+# 已存在的資料庫也會補建索引。
+POSTGRES_SEARCH_OPCLASSES = {"pg_bigm": "gin_bigm_ops", "pg_trgm": "gin_trgm_ops"}
+
+logger = logging.getLogger(__name__)
+
+
+def ensure_postgres_search_indexes(connection: Connection) -> Optional[str]:
+    """安裝可用的搜尋 extension 並建立對應索引，回傳採用的 extension（都沒有時為 None）。"""
+    # installed_version 不為 NULL 表示已安裝
+    available = dict(
+        connection.execute(
+            text("SELECT name, installed_version FROM pg_available_extensions WHERE name IN ('pg_bigm', 'pg_trgm')")
+        ).all()
+    )
+    for extension, opclass in POSTGRES_SEARCH_OPCLASSES.items():
+        if extension not in available:
+            continue
+        if available[extension] is None:
+            try:
+                # 沒有 CREATE 權限時只跳過這個 extension，不讓整個 transaction 失敗
+                with connection.begin_nested():
+                    connection.execute(text(f"CREATE EXTENSION IF NOT EXISTS {extension}"))
+            except DBAPIError:
+                logger.warning("could not create extension %s", extension, exc_info=True)
+                continue
+        for col in ("title", "content"):
+            connection.execute(
+                text(
+                    f"CREATE INDEX IF NOT EXISTS ix_journals_{col}_{extension.removeprefix('pg_')} "
+                    f"ON journals USING gin (lower({col}) {opclass})"
+                )
+            )
+        return extension
+    logger.warning("neither pg_bigm nor pg_trgm is available; journal search falls back to full-table LIKE")
+    return None
+
+
+# SQLite：FTS5 沒有二連組 tokenizer，改由 jq_search_tokens() 先把文字拆成以空白分隔的 token，再交給
+# unicode61（負責大小寫折疊）。token 前面加上 "<user_id>x"，每位使用者的 token 互不相同，MATCH 只會
+# 讀到該使用者的 doclist，不必先撈出所有使用者的命中再過濾。
+_RUN = re.compile(r"[^\W_]+")
+
+
+def search_token_runs(text: Optional[str]) -> list[str]:
+    """切出連續的文字 / 數字片段（與 unicode61 的 token 字元一致，底線、標點、空白都是分隔）。"""
+    return _RUN.findall(text or "")
+
+
+def search_tokens(user_id: int, text: Optional[str]) -> str:
+    """每個片段逐字取「這個字 + 下一個字」，片段最後一個字單獨成 token；例如 "龍山寺" -> 龍山 山寺 寺。
+
+    每個字都恰好是一個 token 的開頭：兩字以上的詞是相鄰二連組組成的 phrase，單字用前綴查詢。
+    """
+    prefix = f"{user_id}x"
+    return " ".join(prefix + run[i : i + 2] for run in search_token_runs(text) for i in range(len(run)))
+
+
+SQLITE_FUNCTIONS["jq_search_tokens"] = (2, search_tokens)
+
+# 索引內容不另外儲存（external content 指向 journals_fts_source view），由 trigger 隨 journals 寫入同步
+# （包含批次 upsert 的 ON CONFLICT DO UPDATE）；view 與 trigger 都呼叫 jq_search_tokens，
+# 連線必須先以 database.register_sqlite_functions() 註冊
+_TOKENS = "jq_search_tokens({row}.user_id, {row}.title), jq_search_tokens({row}.user_id, {row}.content)"
+SQLITE_FTS_DDL = (
+    "CREATE VIEW IF NOT EXISTS journals_fts_source AS SELECT id, "
+    "jq_search_tokens(user_id, title) AS title, jq_search_tokens(user_id, content) AS content FROM journals",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS journals_fts USING fts5("
+    "title, content, content='journals_fts_source', content_rowid='id', tokenize='unicode61')",
+    "CREATE TRIGGER IF NOT EXISTS journals_fts_ai AFTER INSERT ON journals BEGIN "
+    f"INSERT INTO journals_fts(rowid, title, content) VALUES (new.id, {_TOKENS.format(row='new')}); END",
+    "CREATE TRIGGER IF NOT EXISTS journals_fts_ad AFTER DELETE ON journals BEGIN "
+    "INSERT INTO journals_fts(journals_fts, rowid, title, content) "
+    f"VALUES ('delete', old.id, {_TOKENS.format(row='old')}); END",
+    "CREATE TRIGGER IF NOT EXISTS journals_fts_au AFTER UPDATE OF user_id, title, content ON journals BEGIN "
+    "INSERT INTO journals_fts(journals_fts, rowid, title, content) "
+    f"VALUES ('delete', old.id, {_TOKENS.format(row='old')}); "
+    f"INSERT INTO journals_fts(rowid, title, content) VALUES (new.id, {_TOKENS.format(row='new')}); END",
+)
+for _ddl in SQLITE_FTS_DDL:
+    event.listen(Journal.__table__, "after_create", DDL(_ddl).execute_if(dialect="sqlite"))
+for _ddl in ("DROP TABLE IF EXISTS journals_fts", "DROP VIEW IF EXISTS journals_fts_source"):
+    event.listen(Journal.__table__, "before_drop", DDL(_ddl).execute_if(dialect="sqlite"))
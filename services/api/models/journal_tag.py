@@ -0,0 +1,20 @@
+from sqlalchemy import ForeignKey, Index, Integer, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from services.api.database import Base
+
+
+class JournalTag(Base):
+    """日記標籤的篩選索引；與 Journal.tags 在同一個 transaction 內由 search_service.set_tags 維護。"""
+
+    __tablename__ = "journal_tags"
+    __table_args__ = (
+        UniqueConstraint("journal_id", "tag", name="uq_journal_tags_journal_tag"),
+        # 標籤篩選：WHERE user_id = ? AND tag IN (...) 只需掃索引
+        Index("ix_journal_tags_user_tag_journal", "user_id", "tag", "journal_id"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    journal_id: Mapped[int] = mapped_column(ForeignKey("journals.id", ondelete="CASCADE"))
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
+    tag: Mapped[str] = mapped_column(String(32))
@@ -0,0 +1,19 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import ForeignKey, Index, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from services.api.database import Base, UTCDateTime, utcnow
+
+
+class Mission(Base):
+    __tablename__ = "missions"
+    __table_args__ = (Index("ix_missions_created_id", "created_at", "id"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    title: Mapped[str] = mapped_column(String(200))
+    description: Mapped[str] = mapped_column(Text, default="")
+    # 完成任務時解鎖的卡片
+    reward_card_id: Mapped[Optional[int]] = mapped_column(ForeignKey("cards.id", ondelete="SET NULL"), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(UTCDateTime, default=utcnow)
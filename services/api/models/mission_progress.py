@@ -0,0 +1,23 @@
+from datetime import datetime
+
+from sqlalchemy import Boolean, ForeignKey, Index, Integer, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from services.api.database import Base, UTCDateTime, utcnow
+
+
+class MissionProgress(Base):
+    __tablename__ = "mission_progress"
+    __table_args__ = (
+        UniqueConstraint("user_id", "mission_id", name="uq_mission_progress_user_mission"),
+        # 首頁「進行中任務」：WHERE user_id = ? AND completed = false ORDER BY updated_at DESC
+        Index("ix_mission_progress_user_active", "user_id", "completed", "updated_at"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
+    mission_id: Mapped[int] = mapped_column(ForeignKey("missions.id", ondelete="CASCADE"))
+    progress: Mapped[int] = mapped_column(Integer, default=0)
+    completed: Mapped[bool] = mapped_column(Boolean, default=False)
+    created_at: Mapped[datetime] = mapped_column(UTCDateTime, default=utcnow)
+    updated_at: Mapped[datetime] = mapped_column(UTCDateTime, default=utcnow, onupdate=utcnow)
@@ -0,0 +1,19 @@
+from datetime import datetime
+
+from sqlalchemy import ForeignKey, Index, Integer, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from services.api.database import Base, UTCDateTime, utcnow
+
+
+class UserCard(Base):
+    __tablename__ = "user_cards"
+    __table_args__ = (
+        UniqueConstraint("user_id", "card_id", name="uq_user_cards_user_card"),
+        Index("ix_user_cards_user_unlocked", "user_id", "unlocked_at"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
+    card_id: Mapped[int] = mapped_column(ForeignKey("cards.id", ondelete="CASCADE"))
+    unlocked_at: Mapped[datetime] = mapped_column(UTCDateTime, default=utcnow)
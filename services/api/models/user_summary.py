@@ -0,0 +1,25 @@
+from datetime import date, datetime
+from typing import Optional
+
+from sqlalchemy import JSON, Date, ForeignKey, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from services.api.database import Base, UTCDateTime, utcnow
+
+
+class UserSummary(Base):
+    """首頁用的每位使用者摘要；寫入日記 / 任務時增量更新，背景 job 定期整批重算校正。"""
+
+    __tablename__ = "user_summaries"
+
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    journal_count: Mapped[int] = mapped_column(Integer, default=0)
+    streak_days: Mapped[int] = mapped_column(Integer, default=0)
+    longest_streak: Mapped[int] = mapped_column(Integer, default=0)
+    last_journal_date: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
+    # 最近幾篇日記的快照 [{"id", "title", "created_at"}]，首頁不必再查 journals
+    recent_journals: Mapped[list] = mapped_column(JSON, default=list)
+    # 進行中 / 已完成任務數；首頁的任務清單只列幾筆，總數由這裡提供
+    active_missions: Mapped[int] = mapped_column(Integer, default=0)
+    completed_missions: Mapped[int] = mapped_column(Integer, default=0)
+    updated_at: Mapped[datetime] = mapped_column(UTCDateTime, default=utcnow, onupdate=utcnow)
@@ -0,0 +1,105 @@
+# services/api/pagination.py
+# 共用 keyset（cursor）分頁與 NDJSON 串流匯出
+#
+# 所有列表一律依 (created_at DESC, id DESC) 排序，游標記錄上一頁最後一筆的 (created_at, id)，
+# 下一頁只需 WHERE (created_at, id) < (:ts, :id)，配合 models 裡的複合索引不會隨頁數變慢。
+import base64
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, AsyncIterator, Optional
+
+from fastapi import HTTPException, Query
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy import Select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from services.api.database import SessionLocal
+from services.api.responses import dumps_rows
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+# 串流匯出時每次從 DB cursor 取回的筆數
+STREAM_BATCH = 500
+
+
+@dataclass(frozen=True)
+class PageParams:
+    cursor: Optional[str]
+    limit: int
+
+
+def page_params(
+    cursor: Optional[str] = Query(None, description="上一頁回傳的 next_cursor"),
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+) -> PageParams:
+    return PageParams(cursor=cursor, limit=limit)
+
+
+def _pack(*parts: Any) -> str:
+    raw = "|".join(str(p) for p in parts).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _unpack(cursor: str) -> list[str]:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    return base64.urlsafe_b64decode(padded).decode().rsplit("|", 1)
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    return _pack(created_at.isoformat(), row_id)
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        ts, row_id = _unpack(cursor)
+        return datetime.fromisoformat(ts), int(row_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="invalid cursor")
+
+
+def encode_rank_cursor(rank: float, row_id: int) -> str:
+    """依相關度排序的列表（例如搜尋）用的游標；repr 保證 float 來回轉換不失真。"""
+    return _pack(repr(float(rank)), row_id)
+
+
+def decode_rank_cursor(cursor: str) -> tuple[float, int]:
+    try:
+        rank, row_id = _unpack(cursor)
+        return float(rank), int(row_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="invalid cursor")
+
+
+def keyset(stmt: Select, model: Any, cursor: Optional[str] = None) -> Select:
+    """套上排序與游標條件；model 需有 created_at、id 欄位。"""
+    if cursor:
+        ts, row_id = decode_cursor(cursor)
+        stmt = stmt.where(tuple_(model.created_at, model.id) < tuple_(ts, row_id))
+    return stmt.order_by(model.created_at.desc(), model.id.desc())
+
+
+async def fetch_page(db: AsyncSession, stmt: Select, model: Any, params: PageParams) -> tuple[list, Optional[str]]:
+    # 多取一筆判斷是否還有下一頁，免去額外的 COUNT 查詢
+    stmt = keyset(stmt, model, params.cursor).limit(params.limit + 1)
+    rows = list((await db.scalars(stmt)).all())
+    next_cursor = None
+    if len(rows) > params.limit:
+        rows = rows[: params.limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+    return rows, next_cursor
+
+
+def stream_ndjson(stmt: Select, model: Any, item_model: type[BaseModel]) -> StreamingResponse:
+    """以 NDJSON 逐筆輸出查詢結果；rows 隨 DB cursor 產出即寫出，伺服器端記憶體不隨結果大小成長。"""
+    stmt = keyset(stmt, model).execution_options(yield_per=STREAM_BATCH)
+
+    async def body() -> AsyncIterator[bytes]:
+        # 串流會比 request 的 get_db 活得久，所以自己開 session
+        async with SessionLocal() as db:
+            result = await db.stream_scalars(stmt)
+            async for row in result:
+                yield dumps_rows(item_model, row) + b"\n"
+
+    return StreamingResponse(body(), media_type="application/x-ndjson")
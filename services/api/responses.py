@@ -0,0 +1,64 @@
+# services/api/responses.py
+# JSON 輸出的快速路徑
+#
+# - ORJSONResponse：app 的預設 response class，dict 類回應改用 orjson 序列化
+# - orm_response / page_response：列表端點直接把 ORM rows 交給 orjson；orjson 每遇到一筆 row 就呼叫
+#   orm_encoder，依回應 model（例如 JournalOut）的欄位從 instance 已載入的狀態（__dict__）組出一個
+#   小 dict 交回去序列化。仍是每筆一個 dict，但不會先建好整份 dict 列表、不經過 jsonable_encoder
+#   的遞迴複製，也省掉逐筆 pydantic 驗證；輸出格式與 response_model 宣告一致
+from functools import lru_cache
+from typing import Any, Callable, Optional
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from starlette.responses import Response
+
+# datetime 一律輸出 "...Z"，與 pydantic 序列化 UTC 時間的格式相同
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+class ORJSONResponse(JSONResponse):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=ORJSON_OPTIONS)
+
+
+@lru_cache(maxsize=None)
+def orm_encoder(item_model: type[BaseModel]) -> Callable[[Any], Any]:
+    """orjson 遇到 ORM 物件時呼叫；依 item_model 的欄位直接從 __dict__ 取值。"""
+    fields = tuple(item_model.model_fields)
+
+    def encode(obj: Any) -> Any:
+        if isinstance(obj, BaseModel):
+            return obj.model_dump(mode="json")
+        state = getattr(obj, "__dict__", None)
+        if state is None:
+            raise TypeError(f"{type(obj).__name__} is not JSON serializable")
+        try:
+            # 已載入的欄位值存在 instance __dict__，繞過 instrumented attribute 的存取成本
+            return {name: state[name] for name in fields}
+        except KeyError:
+            # 有欄位尚未載入（expired / deferred）時退回一般屬性存取
+            return {name: getattr(obj, name) for name in fields}
+
+    return encode
+
+
+def dumps_rows(item_model: type[BaseModel], content: Any) -> bytes:
+    return orjson.dumps(content, default=orm_encoder(item_model), option=ORJSON_OPTIONS)
+
+
+def orm_response(item_model: type[BaseModel], content: Any, status_code: int = 200) -> Response:
+    return Response(content=dumps_rows(item_model, content), status_code=status_code, media_type="application/json")
+
+
+def page_response(item_model: type[BaseModel], rows: list, next_cursor: Optional[str]) -> Response:
+    return orm_response(item_model, {"items": rows, "next_cursor": next_cursor})
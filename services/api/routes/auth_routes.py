@@ -0,0 +1,54 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from services.api.database import get_db
+from services.api.models.user import User
+from services.api.schemas.auth import LoginRequest, MeOut, RefreshRequest, RegisterRequest, TokenPair
+from services.api.schemas.user import UserOut
+from services.api.services import auth_service
+from services.api.services.auth_service import AuthUser, get_current_user
+
+router = APIRouter(prefix="/auth", tags=["auth"])
+
+@router.post("/register", response_model=UserOut, status_code=201)
+async def register(payload: RegisterRequest, db: AsyncSession = Depends(get_db)):
+    user = User(
+        email=payload.email,
+        nickname=payload.nickname,
+        is_admin=auth_service.is_admin_email(payload.email),
+        password_hash=await auth_service.hash_password(payload.password),
+    )
+    db.add(user)
+    try:
+        await db.commit()
+    except IntegrityError:
+        raise HTTPException(status_code=409, detail="email already registered")
+    return user
+
+@router.post("/login", response_model=TokenPair)
+async def login(payload: LoginRequest, db: AsyncSession = Depends(get_db)):
+    user = await db.scalar(select(User).where(User.email == payload.email))
+    # 帳號不存在也照樣跑一次雜湊，避免以回應時間探測 email 是否註冊
+    encoded = user.password_hash if user is not None else auth_service.DUMMY_HASH
+    if not await auth_service.verify_password(payload.password, encoded) or user is None:
+        raise HTTPException(status_code=401, detail="invalid credentials")
+    tokens = await auth_service.issue_tokens(db, user.id)
+    await db.commit()
+    return tokens
+
+@router.post("/refresh", response_model=TokenPair)
+async def refresh(payload: RefreshRequest, db: AsyncSession = Depends(get_db)):
+    tokens = await auth_service.rotate_refresh_token(db, payload.refresh_token)
+    await db.commit()
+    return tokens
+
+@router.post("/logout", status_code=204)
+async def logout(payload: RefreshRequest, db: AsyncSession = Depends(get_db)):
+    await auth_service.logout(db, payload.refresh_token)
+    await db.commit()
+
+@router.get("/me", response_model=MeOut)
+async def me(user: AuthUser = Depends(get_current_user)):
+    return {"id": user.id, "claims": user.claims}
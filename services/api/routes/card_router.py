@@ -1,7 +1,37 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from services.api.cache import invalidate
+from services.api.database import get_db
+from services.api.models.card import Card
+from services.api.pagination import PageParams, fetch_page, page_params, stream_ndjson
+from services.api.responses import page_response
+from services.api.schemas.cards import CardCreate, CardOut
+from services.api.schemas.common import CursorPage
+from services.api.services.auth_service import AuthUser, require_admin
 
 router = APIRouter(prefix="/cards", tags=["cards"])
 
-@router.get("/")
-def list_cards():
-    return {"message": "cards ok"}
+@router.get("/", response_model=CursorPage[CardOut])
+async def list_cards(page: PageParams = Depends(page_params), db: AsyncSession = Depends(get_db)):
+    rows, next_cursor = await fetch_page(db, select(Card), Card, page)
+    return page_response(CardOut, rows, next_cursor)
+
+@router.get("/export")
+async def export_cards():
+    return stream_ndjson(select(Card), Card, CardOut)
+
+@router.post("/", response_model=CardOut, status_code=201)
+async def create_card(
+    payload: CardCreate, admin: AuthUser = Depends(require_admin), db: AsyncSession = Depends(get_db)
+):
+    card = Card(**payload.model_dump())
+    db.add(card)
+    try:
+        await db.commit()
+    except IntegrityError:
+        raise HTTPException(status_code=409, detail="card code already exists")
+    await invalidate("cards")
+    return card
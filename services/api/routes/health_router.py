@@ -1,7 +1,16 @@
+from typing import Dict
+
 from fastapi import APIRouter
 
+from services.api.cache import response_cache
+from services.api.schemas.common import StatusOut
+
 router = APIRouter(prefix="/health", tags=["health"])
 
-@router.get("/ping")
-def ping():
+@router.get("/ping", response_model=StatusOut)
+async def ping():
     return {"status": "ok"}
+
+@router.get("/cache", response_model=Dict[str, int])
+async def cache_stats():
+    return response_cache.stats.as_dict()
@@ -0,0 +1,11 @@
+from fastapi import APIRouter, Depends
+
+from services.api.schemas.home import HomeFeed
+from services.api.services import home_service
+from services.api.services.auth_service import AuthUser, get_current_user
+
+router = APIRouter(prefix="/home", tags=["home"])
+
+@router.get("", response_model=HomeFeed)
+async def home(user: AuthUser = Depends(get_current_user)):
+    return await home_service.build_home(user.id)
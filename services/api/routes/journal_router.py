@@ -1,7 +1,74 @@
-from fastapi import APIRouter
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from services.api.database import get_db
+from services.api.models.journal import Journal
+from services.api.pagination import PageParams, fetch_page, page_params, stream_ndjson
+from services.api.responses import page_response
+from services.api.schemas.common import BatchResult, CursorPage
+from services.api.schemas.journal import JournalBatchRequest, JournalCreate, JournalOut, normalize_tags
+from services.api.services import batch_service, home_service, search_service
+from services.api.services.auth_service import AuthUser, get_current_user
 
 router = APIRouter(prefix="/journals", tags=["journals"])
 
-@router.get("/")
-def list_journals():
-    return {"message": "journals ok"}
+
+def _journal_query(user_id: int):
+    return select(Journal).where(Journal.user_id == user_id)
+
+@router.get("/", response_model=CursorPage[JournalOut])
+async def list_journals(
+    page: PageParams = Depends(page_params),
+    user: AuthUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    rows, next_cursor = await fetch_page(db, _journal_query(user.id), Journal, page)
+    return page_response(JournalOut, rows, next_cursor)
+
+@router.get("/search", response_model=CursorPage[JournalOut])
+async def search_journals(
+    q: Optional[str] = Query(None, max_length=200, description="以空白分隔的關鍵字，全部都要命中"),
+    tag: List[str] = Query([], description="可重複；必須同時帶有所有標籤"),
+    page: PageParams = Depends(page_params),
+    user: AuthUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    try:
+        tags = normalize_tags(tag)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    if not search_service.parse_terms(q) and not tags:
+        raise HTTPException(status_code=400, detail="q or tag is required")
+    rows, next_cursor = await search_service.search_journals(db, user.id, q, tags, page)
+    return page_response(JournalOut, rows, next_cursor)
+
+@router.get("/export")
+async def export_journals(user: AuthUser = Depends(get_current_user)):
+    return stream_ndjson(_journal_query(user.id), Journal, JournalOut)
+
+@router.post("/", response_model=JournalOut, status_code=201)
+async def create_journal(
+    payload: JournalCreate,
+    user: AuthUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    journal = Journal(user_id=user.id, **payload.model_dump())
+    db.add(journal)
+    await db.flush()
+    await search_service.set_tags(db, user.id, {journal.id: journal.tags})
+    await home_service.on_journal_written(db, journal)
+    await db.commit()
+    return journal
+
+@router.post("/batch", response_model=BatchResult)
+async def create_journals_batch(
+    payload: JournalBatchRequest,
+    user: AuthUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    result = await batch_service.upsert_journals(db, user.id, payload.items)
+    await db.commit()
+    return result
@@ -0,0 +1,18 @@
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import PlainTextResponse
+
+from services.api import metrics
+from services.api.services.auth_service import AuthUser, require_admin
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+@router.get("", response_class=PlainTextResponse, include_in_schema=False)
+def prometheus_metrics():
+    return PlainTextResponse(metrics.registry.render(), media_type="text/plain; version=0.0.4")
+
+@router.get("/profiles", response_class=PlainTextResponse, include_in_schema=False)
+def slowest_profiles(admin: AuthUser = Depends(require_admin)):
+    # stack 含伺服器上的原始碼絕對路徑，只給管理者看
+    if metrics.sampler is None:
+        raise HTTPException(status_code=404, detail="profiler disabled (set PROFILE_SLOWEST)")
+    return metrics.sampler.dump()
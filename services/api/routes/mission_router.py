@@ -1,7 +1,92 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from services.api.cache import invalidate
+from services.api.database import get_db
+from services.api.models.card import Card
+from services.api.models.mission import Mission
+from services.api.models.mission_progress import MissionProgress
+from services.api.models.user_card import UserCard
+from services.api.pagination import PageParams, fetch_page, page_params, stream_ndjson
+from services.api.responses import page_response
+from services.api.schemas.common import BatchResult, CursorPage
+from services.api.schemas.mission import (
+    MissionCreate,
+    MissionOut,
+    MissionProgressBatchRequest,
+    MissionProgressOut,
+    MissionProgressUpdate,
+)
+from services.api.services import batch_service, home_service
+from services.api.services.auth_service import AuthUser, get_current_user, require_admin
 
 router = APIRouter(prefix="/missions", tags=["missions"])
 
-@router.get("/")
-def list_missions():
-    return {"message": "missions ok"}
+
+@router.get("/", response_model=CursorPage[MissionOut])
+async def list_missions(page: PageParams = Depends(page_params), db: AsyncSession = Depends(get_db)):
+    rows, next_cursor = await fetch_page(db, select(Mission), Mission, page)
+    return page_response(MissionOut, rows, next_cursor)
+
+@router.get("/export")
+async def export_missions():
+    return stream_ndjson(select(Mission), Mission, MissionOut)
+
+@router.post("/", response_model=MissionOut, status_code=201)
+async def create_mission(
+    payload: MissionCreate, admin: AuthUser = Depends(require_admin), db: AsyncSession = Depends(get_db)
+):
+    # SQLite 預設不檢查外鍵，先查一次讓兩個後端行為一致
+    if payload.reward_card_id is not None and await db.get(Card, payload.reward_card_id) is None:
+        raise HTTPException(status_code=422, detail="reward card not found")
+    mission = Mission(**payload.model_dump())
+    db.add(mission)
+    try:
+        await db.commit()
+    except IntegrityError:
+        # 查完之後卡片才被刪掉（PostgreSQL 的外鍵檢查）
+        raise HTTPException(status_code=422, detail="reward card not found")
+    await invalidate("missions")
+    return mission
+
+@router.post("/{mission_id}/progress", response_model=MissionProgressOut)
+async def update_progress(
+    mission_id: int,
+    payload: MissionProgressUpdate,
+    user: AuthUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    mission = await db.get(Mission, mission_id)
+    if mission is None:
+        raise HTTPException(status_code=404, detail="mission not found")
+    record = await db.scalar(
+        select(MissionProgress).where(MissionProgress.user_id == user.id, MissionProgress.mission_id == mission_id)
+    )
+    was_completed = record.completed if record is not None else None
+    if record is None:
+        record = MissionProgress(user_id=user.id, mission_id=mission_id)
+        db.add(record)
+    record.progress = payload.progress
+    record.completed = payload.completed
+    if payload.completed and not was_completed and mission.reward_card_id is not None:
+        unlocked = await db.scalar(
+            select(UserCard.id).where(UserCard.user_id == user.id, UserCard.card_id == mission.reward_card_id)
+        )
+        if unlocked is None:
+            db.add(UserCard(user_id=user.id, card_id=mission.reward_card_id))
+    await db.flush()
+    await home_service.on_mission_progress(db, user.id, was_completed, payload.completed)
+    await db.commit()
+    return record
+
+@router.post("/progress/batch", response_model=BatchResult)
+async def update_progress_batch(
+    payload: MissionProgressBatchRequest,
+    user: AuthUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    result = await batch_service.upsert_mission_progress(db, user.id, payload.items)
+    await db.commit()
+    return result
@@ -1,7 +1,21 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from services.api.database import get_db
+from services.api.models.user import User
+from services.api.responses import orm_response
+from services.api.schemas.user import UserList, UserOut
+from services.api.services.auth_service import AuthUser, require_admin
 
 router = APIRouter(prefix="/users", tags=["users"])
 
-@router.get("/")
-def list_users():
-    return {"message": "users ok"}
+# 回傳所有人的 email，只開放給管理者
+@router.get("/", response_model=UserList)
+async def list_users(
+    limit: int = Query(50, ge=1, le=200),
+    admin: AuthUser = Depends(require_admin),
+    db: AsyncSession = Depends(get_db),
+):
+    rows = (await db.scalars(select(User).order_by(User.id).limit(limit))).all()
+    return orm_response(UserOut, {"items": rows})
@@ -0,0 +1,19 @@
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+from services.api.schemas.common import ORMModel
+
+
+class CardCreate(BaseModel):
+    code: str = Field(..., max_length=32)
+    name: str = Field(..., max_length=100)
+    description: str = ""
+
+
+class CardOut(ORMModel):
+    id: int
+    code: str
+    name: str
+    description: str
+    created_at: datetime
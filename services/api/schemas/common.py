@@ -0,0 +1,38 @@
+from typing import Generic, List, Literal, Optional, TypeVar
+
+from pydantic import BaseModel, ConfigDict, Field
+
+T = TypeVar("T")
+
+# 單次批次寫入的上限，避免一個請求佔住 transaction 太久
+MAX_BATCH_ITEMS = 500
+
+
+class ORMModel(BaseModel):
+    # 回應 model 直接從 ORM 物件讀屬性，不需要先轉成 dict
+    model_config = ConfigDict(from_attributes=True)
+
+
+class StatusOut(BaseModel):
+    status: str
+
+
+class CursorPage(BaseModel, Generic[T]):
+    items: List[T]
+    # 不透明游標；帶回 ?cursor= 取下一頁，None 表示已到最後一頁
+    next_cursor: Optional[str] = Field(default=None)
+
+
+class BatchItemResult(BaseModel):
+    index: int
+    client_id: Optional[str] = None
+    status: Literal["created", "updated", "error"]
+    id: Optional[int] = None
+    error: Optional[str] = None
+
+
+class BatchResult(BaseModel):
+    created: int = 0
+    updated: int = 0
+    failed: int = 0
+    results: List[BatchItemResult]
@@ -0,0 +1,42 @@
+from datetime import date, datetime
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class HomeJournal(BaseModel):
+    id: int
+    title: str
+    created_at: datetime
+
+
+class HomeMission(BaseModel):
+    mission_id: int
+    title: str
+    progress: int
+    updated_at: datetime
+
+
+class HomeCard(BaseModel):
+    card_id: int
+    code: str
+    name: str
+    unlocked_at: datetime
+
+
+class HomeStreak(BaseModel):
+    current: int
+    longest: int
+    last_journal_date: Optional[date] = None
+
+
+class HomeFeed(BaseModel):
+    user_id: int
+    journal_count: int
+    streak: HomeStreak
+    recent_journals: List[HomeJournal]
+    # 最近更新的幾個進行中任務；總數見 active_mission_count
+    active_missions: List[HomeMission]
+    active_mission_count: int
+    new_cards: List[HomeCard]
+    completed_missions: int
@@ -0,0 +1,68 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field, field_validator
+
+from services.api.schemas.common import MAX_BATCH_ITEMS, ORMModel
+
+
+MAX_TAGS = 10
+MAX_TAG_LENGTH = 32
+# 離線日記的 created_at 最多可比伺服器時間晚這麼多（裝置時鐘誤差）
+MAX_CLOCK_SKEW = timedelta(minutes=5)
+
+
+def normalize_tags(tags: List[str]) -> List[str]:
+    """去頭尾空白、轉小寫、去重（保留順序）；搜尋的標籤篩選也用同一套規則。"""
+    seen: Dict[str, None] = {}
+    for tag in tags:
+        tag = tag.strip().lower()
+        if not tag:
+            continue
+        if len(tag) > MAX_TAG_LENGTH:
+            raise ValueError(f"tag longer than {MAX_TAG_LENGTH} characters")
+        seen[tag] = None
+    return list(seen)
+
+
+class JournalCreate(BaseModel):
+    title: str = Field("", max_length=200)
+    content: str = ""
+    tags: List[str] = Field(default_factory=list, max_length=MAX_TAGS)
+
+    @field_validator("tags")
+    @classmethod
+    def _normalize_tags(cls, tags: List[str]) -> List[str]:
+        return normalize_tags(tags)
+
+
+class JournalOut(ORMModel):
+    id: int
+    user_id: int
+    client_id: Optional[str] = None
+    title: str
+    content: str
+    tags: List[str] = []
+    created_at: datetime
+
+
+class JournalBatchItem(JournalCreate):
+    client_id: str = Field(..., min_length=1, max_length=64)
+    # 離線撰寫的時間；未帶時以伺服器收到的時間為準
+    created_at: Optional[datetime] = None
+
+    @field_validator("created_at")
+    @classmethod
+    def _utc_not_future(cls, value: Optional[datetime]) -> Optional[datetime]:
+        # 統一轉成 UTC（沒帶時區視為 UTC）；未來時間會讓 streak、排序錯亂，直接拒絕
+        if value is None:
+            return None
+        value = value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+        if value > datetime.now(timezone.utc) + MAX_CLOCK_SKEW:
+            raise ValueError("created_at is in the future")
+        return value
+
+
+class JournalBatchRequest(BaseModel):
+    # 逐筆驗證（JournalBatchItem），單筆不合法只回報該筆錯誤，不會讓整批 422
+    items: List[Dict[str, Any]] = Field(..., min_length=1, max_length=MAX_BATCH_ITEMS)
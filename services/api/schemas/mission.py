@@ -0,0 +1,42 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+from services.api.schemas.common import MAX_BATCH_ITEMS, ORMModel
+
+
+class MissionCreate(BaseModel):
+    title: str = Field(..., max_length=200)
+    description: str = ""
+    reward_card_id: Optional[int] = None
+
+
+class MissionOut(ORMModel):
+    id: int
+    title: str
+    description: str
+    reward_card_id: Optional[int] = None
+    created_at: datetime
+
+
+class MissionProgressUpdate(BaseModel):
+    progress: int = Field(0, ge=0, le=100)
+    completed: bool = False
+
+
+class MissionProgressOut(ORMModel):
+    mission_id: int
+    progress: int
+    completed: bool
+    updated_at: datetime
+
+
+class MissionProgressBatchItem(MissionProgressUpdate):
+    client_id: str = Field(..., min_length=1, max_length=64)
+    mission_id: int
+
+
+class MissionProgressBatchRequest(BaseModel):
+    # 逐筆驗證（MissionProgressBatchItem），單筆不合法只回報該筆錯誤
+    items: List[Dict[str, Any]] = Field(..., min_length=1, max_length=MAX_BATCH_ITEMS)
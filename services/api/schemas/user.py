@@ -0,0 +1,15 @@
+from datetime import datetime
+from typing import List
+
+from services.api.schemas.common import ORMModel
+
+
+class UserOut(ORMModel):
+    id: int
+    email: str
+    nickname: str
+    created_at: datetime
+
+
+class UserList(ORMModel):
+    items: List[UserOut]
@@ -0,0 +1,363 @@
+# services/api/services/auth_service.py
+# 無狀態 JWT 驗證
+#
+# - access token 只驗簽章與到期時間，不查 DB；解出的 claims 依 token 放進 LRU 直到過期
+# - refresh token 記錄在 tokens 表（RefreshToken），登出 / 輪替時寫入 revoked_at
+# - 撤銷檢查走記憶體內的 bloom filter，背景工作依 revoked_at 水位線增量同步；
+#   bloom 命中（可能是誤判）時才回 DB 確認
+# - 密碼雜湊（scrypt）丟到有上限的 thread pool，登入尖峰不會卡住 event loop
+import asyncio
+import base64
+import hashlib
+import hmac
+import logging
+import math
+import secrets
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Any, Optional
+
+import jwt
+from fastapi import Depends, HTTPException
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from services.api.config import settings
+from services.api.database import SessionLocal, get_db, utcnow
+from services.api.models.tokens import RefreshToken
+from services.api.models.user import User
+
+logger = logging.getLogger(__name__)
+
+
+# ---------------------------------------------------------------- 金鑰
+@dataclass(frozen=True)
+class KeySet:
+    keys: dict[str, str]
+    active_kid: str
+    algorithm: str
+
+    def signing_key(self) -> tuple[str, str]:
+        return self.active_kid, self.keys[self.active_kid]
+
+
+@lru_cache(maxsize=1)
+def get_key_set() -> KeySet:
+    # 解析一次後快取；輪替金鑰時把新 kid 加進 JWT_KEYS、改 JWT_ACTIVE_KID，舊 kid 保留到 token 過期
+    keys = {}
+    for pair in filter(None, (p.strip() for p in settings.jwt_keys.split(","))):
+        kid, _, secret = pair.partition(":")
+        keys[kid] = secret
+    if not keys:
+        logger.warning("JWT_KEYS not set; using a random per-process signing key")
+        keys = {"dev": secrets.token_urlsafe(32)}
+    active = settings.jwt_active_kid or next(iter(keys))
+    return KeySet(keys=keys, active_kid=active, algorithm=settings.jwt_algorithm)
+
+
+# ---------------------------------------------------------------- claims 快取
+class ClaimsCache:
+    """token -> claims 的 LRU；項目在 token 的 exp 之後視為不存在。"""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._data: "OrderedDict[str, dict[str, Any]]" = OrderedDict()
+
+    def get(self, token: str) -> Optional[dict[str, Any]]:
+        claims = self._data.get(token)
+        if claims is None:
+            return None
+        if claims["exp"] <= time.time():
+            del self._data[token]
+            return None
+        self._data.move_to_end(token)
+        return claims
+
+    def put(self, token: str, claims: dict[str, Any]) -> None:
+        if self.max_size <= 0:
+            return
+        self._data[token] = claims
+        self._data.move_to_end(token)
+        if len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+claims_cache = ClaimsCache(settings.claims_cache_size)
+
+
+# ---------------------------------------------------------------- 撤銷清單
+class BloomFilter:
+    def __init__(self, capacity: int, fp_rate: float):
+        self.capacity = max(1, capacity)
+        self.size = max(8, int(-self.capacity * math.log(fp_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / self.capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str):
+        # double hashing：兩個 64-bit 值組出 k 個位置
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, item: str) -> None:
+        for pos in self._positions(item):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+# 增量同步時往回多看一段時間，涵蓋同步當下尚未 commit 的撤銷
+SYNC_OVERLAP = timedelta(seconds=60)
+
+class RevocationList:
+    def __init__(self, capacity: int, fp_rate: float):
+        self.capacity = capacity
+        self.fp_rate = fp_rate
+        self.bloom = BloomFilter(capacity, fp_rate)
+        self.watermark: Optional[datetime] = None
+        # 重建期間本進程新撤銷的 jti，換上新 filter 前補進去
+        self._pending: Optional[list[str]] = None
+
+    def add(self, jti: str) -> None:
+        if jti not in self.bloom:
+            self.bloom.add(jti)
+        if self._pending is not None:
+            self._pending.append(jti)
+
+    def might_be_revoked(self, jti: str) -> bool:
+        return jti in self.bloom
+
+    async def sync(self, db: AsyncSession) -> int:
+        """只讀取水位線之後新撤銷的 jti；第一次同步或 filter 已滿時改成重建。"""
+        if self.watermark is None or self.bloom.count >= self.bloom.capacity:
+            return await self._rebuild(db)
+        stmt = (
+            select(RefreshToken.jti, RefreshToken.revoked_at)
+            .where(RefreshToken.revoked_at >= self.watermark - SYNC_OVERLAP)
+            .order_by(RefreshToken.revoked_at)
+        )
+        added = 0
+        for jti, revoked_at in (await db.execute(stmt)).all():
+            self.watermark = revoked_at
+            if jti not in self.bloom:
+                self.bloom.add(jti)
+                added += 1
+        return added
+
+    async def _rebuild(self, db: AsyncSession) -> int:
+        # 新 filter 在區域變數裡建好、填滿後才一次換上；查詢期間舊 filter 照常服務，不會出現空窗。
+        # 容量依實際筆數（未過期的撤銷）留一倍餘裕，撤銷數超過設定容量時也不會每輪同步都重建
+        self._pending = []
+        try:
+            stmt = (
+                select(RefreshToken.jti, RefreshToken.revoked_at)
+                .where(RefreshToken.revoked_at.is_not(None), RefreshToken.expires_at > utcnow())
+                .order_by(RefreshToken.revoked_at)
+            )
+            rows = (await db.execute(stmt)).all()
+            bloom = BloomFilter(max(self.capacity, 2 * len(rows)), self.fp_rate)
+            for jti, _ in rows:
+                bloom.add(jti)
+            for jti in self._pending:
+                bloom.add(jti)
+        finally:
+            self._pending = None
+        self.bloom = bloom
+        # 沒有任何撤銷時從現在起算，下一輪仍會往回看 SYNC_OVERLAP
+        self.watermark = rows[-1].revoked_at if rows else utcnow()
+        return len(rows)
+
+
+revocations = RevocationList(settings.revocation_capacity, settings.revocation_fp_rate)
+
+
+async def sync_revocations() -> int:
+    async with SessionLocal() as db:
+        return await revocations.sync(db)
+
+
+async def revocation_sync_loop(interval: float = settings.revocation_sync_interval) -> None:
+    # 第一次完整載入由 main.lifespan 在開始服務前完成
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await sync_revocations()
+        except Exception:
+            logger.exception("revocation sync failed")
+
+
+@lru_cache(maxsize=1)
+def _admin_emails() -> frozenset[str]:
+    return frozenset(e.strip().lower() for e in settings.admin_emails.split(",") if e.strip())
+
+
+def is_admin_email(email: str) -> bool:
+    return email.strip().lower() in _admin_emails()
+
+
+# ---------------------------------------------------------------- 密碼雜湊
+_hash_executor = ThreadPoolExecutor(max_workers=settings.password_hash_workers, thread_name_prefix="pwhash")
+_SCRYPT = {"n": 2**14, "r": 8, "p": 1}
+
+
+def _scrypt(password: str, salt: bytes, n: int, r: int, p: int) -> bytes:
+    return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p, dklen=32)
+
+
+def _b64(raw: bytes) -> str:
+    return base64.b64encode(raw).decode()
+
+
+def _hash_password_sync(password: str) -> str:
+    salt = secrets.token_bytes(16)
+    digest = _scrypt(password, salt, **_SCRYPT)
+    return f"scrypt${_SCRYPT['n']}${_SCRYPT['r']}${_SCRYPT['p']}${_b64(salt)}${_b64(digest)}"
+
+
+def _verify_password_sync(password: str, encoded: str) -> bool:
+    try:
+        _, n, r, p, salt, digest = encoded.split("$")
+        expected = base64.b64decode(digest)
+        actual = _scrypt(password, base64.b64decode(salt), int(n), int(r), int(p))
+    except ValueError:
+        return False
+    return hmac.compare_digest(actual, expected)
+
+
+# 登入時帳號不存在用來比對的假雜湊（參數相同，驗證一定失敗），讓回應時間與密碼錯誤一致
+DUMMY_HASH = "scrypt${n}${r}${p}${salt}${digest}".format(
+    **_SCRYPT, salt=_b64(secrets.token_bytes(16)), digest=_b64(secrets.token_bytes(32))
+)
+
+
+async def hash_password(password: str) -> str:
+    return await asyncio.get_running_loop().run_in_executor(_hash_executor, _hash_password_sync, password)
+
+
+async def verify_password(password: str, encoded: str) -> bool:
+    return await asyncio.get_running_loop().run_in_executor(
+        _hash_executor, _verify_password_sync, password, encoded
+    )
+
+
+# ---------------------------------------------------------------- token
+def _encode(claims: dict[str, Any]) -> str:
+    keys = get_key_set()
+    kid, secret = keys.signing_key()
+    return jwt.encode(claims, secret, algorithm=keys.algorithm, headers={"kid": kid})
+
+
+def _decode(token: str, token_type: str) -> dict[str, Any]:
+    keys = get_key_set()
+    try:
+        kid = jwt.get_unverified_header(token).get("kid")
+        secret = keys.keys[kid]
+        claims = jwt.decode(token, secret, algorithms=[keys.algorithm], options={"require": ["exp", "sub"]})
+    except (jwt.PyJWTError, KeyError):
+        raise HTTPException(status_code=401, detail="invalid token")
+    if claims.get("type") != token_type:
+        raise HTTPException(status_code=401, detail="invalid token")
+    return claims
+
+
+async def issue_tokens(db: AsyncSession, user_id: int) -> dict[str, Any]:
+    """簽發一組 access / refresh token，refresh token 寫入 tokens 表（呼叫端負責 commit）。"""
+    now = utcnow()
+    sid = uuid.uuid4().hex
+    refresh_exp = now + timedelta(seconds=settings.refresh_token_ttl)
+    db.add(RefreshToken(jti=sid, user_id=user_id, expires_at=refresh_exp))
+    access = _encode(
+        {
+            "sub": str(user_id),
+            "sid": sid,
+            "type": "access",
+            "iat": now,
+            "exp": now + timedelta(seconds=settings.access_token_ttl),
+        }
+    )
+    refresh = _encode({"sub": str(user_id), "jti": sid, "type": "refresh", "iat": now, "exp": refresh_exp})
+    return {"access_token": access, "refresh_token": refresh, "expires_in": settings.access_token_ttl}
+
+
+async def _is_revoked(db: AsyncSession, jti: str) -> bool:
+    row = await db.scalar(select(RefreshToken.revoked_at).where(RefreshToken.jti == jti))
+    return row is not None
+
+
+async def revoke(db: AsyncSession, jti: str) -> None:
+    await db.execute(update(RefreshToken).where(RefreshToken.jti == jti).values(revoked_at=utcnow()))
+    # 本進程立即生效；其他 worker 等下一輪同步
+    revocations.add(jti)
+
+
+async def rotate_refresh_token(db: AsyncSession, token: str) -> dict[str, Any]:
+    claims = _decode(token, "refresh")
+    user_id = int(claims["sub"])
+    # 檢查與撤銷合成一個條件式 UPDATE：同一個 refresh token 併發輪替時只有一個請求改得到那一列，
+    # 其餘拿到 rowcount 0，不會各自簽出一組新 token
+    result = await db.execute(
+        update(RefreshToken)
+        .where(
+            RefreshToken.jti == claims["jti"],
+            RefreshToken.user_id == user_id,
+            RefreshToken.revoked_at.is_(None),
+        )
+        .values(revoked_at=utcnow())
+    )
+    if result.rowcount != 1:
+        raise HTTPException(status_code=401, detail="token revoked")
+    revocations.add(claims["jti"])
+    return await issue_tokens(db, user_id)
+
+
+async def logout(db: AsyncSession, token: str) -> None:
+    claims = _decode(token, "refresh")
+    await revoke(db, claims["jti"])
+
+
+# ---------------------------------------------------------------- dependency
+@dataclass(frozen=True)
+class AuthUser:
+    id: int
+    sid: str
+    claims: dict[str, Any]
+
+
+_bearer = HTTPBearer(auto_error=False)
+
+
+async def get_current_user(credentials: Optional[HTTPAuthorizationCredentials] = Depends(_bearer)) -> AuthUser:
+    if credentials is None:
+        raise HTTPException(status_code=401, detail="not authenticated", headers={"WWW-Authenticate": "Bearer"})
+    token = credentials.credentials
+    claims = claims_cache.get(token)
+    if claims is None:
+        claims = _decode(token, "access")
+        claims_cache.put(token, claims)
+    sid = claims["sid"]
+    if revocations.might_be_revoked(sid):
+        # bloom 可能誤判，只有這條少見路徑才回 DB 確認
+        async with SessionLocal() as db:
+            if await _is_revoked(db, sid):
+                raise HTTPException(status_code=401, detail="token revoked")
+    return AuthUser(id=int(claims["sub"]), sid=sid, claims=claims)
+
+
+async def require_admin(user: AuthUser = Depends(get_current_user), db: AsyncSession = Depends(get_db)) -> AuthUser:
+    # 管理操作很少，直接查 DB，撤銷管理權限立即生效（不放進 token claims）
+    if not await db.scalar(select(User.is_admin).where(User.id == user.id)):
+        raise HTTPException(status_code=403, detail="admin only")
+    return user
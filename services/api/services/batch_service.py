@@ -0,0 +1,165 @@
+# services/api/services/batch_service.py
+# 行動端離線同步的批次寫入
+#
+# - 每筆先各自用 pydantic 驗證，不合法的只在該筆回報錯誤
+# - 合法的整批在同一個 transaction 內以單一 multi-row INSERT ... ON CONFLICT 寫入；
+#   日記以 (user_id, client_id)、任務進度以 (user_id, mission_id) 為衝突鍵，重送同一批是冪等的
+# - 首頁摘要、卡片解鎖也都以整批方式更新，不會隨筆數放大查詢次數
+from typing import Any, Callable, Hashable, Optional, Sequence
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from services.api.database import dialect_insert, utcnow
+from services.api.models.journal import Journal
+from services.api.models.mission import Mission
+from services.api.models.mission_progress import MissionProgress
+from services.api.models.user_card import UserCard
+from services.api.schemas.common import BatchItemResult
+from services.api.schemas.journal import JournalBatchItem
+from services.api.schemas.mission import MissionProgressBatchItem
+from services.api.services import home_service, search_service
+
+
+def _error(index: int, client_id: Optional[str], message: str) -> BatchItemResult:
+    return BatchItemResult(index=index, client_id=client_id, status="error", error=message)
+
+
+def _format_errors(exc: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(str(p) for p in e['loc']) or 'item'}: {e['msg']}" for e in exc.errors())
+
+
+def _validate(
+    raw_items: Sequence[Any],
+    model: type[BaseModel],
+    key: Callable[[Any], Hashable],
+    results: list[Optional[BatchItemResult]],
+) -> dict[Hashable, tuple[int, Any]]:
+    """回傳 key -> (index, item)；同一批內重複的 key 以最後一筆為準，前面的標記為錯誤。"""
+    valid: dict[Hashable, tuple[int, Any]] = {}
+    for index, raw in enumerate(raw_items):
+        client_id = raw.get("client_id") if isinstance(raw, dict) else None
+        try:
+            item = model.model_validate(raw)
+        except ValidationError as exc:
+            results[index] = _error(index, client_id, _format_errors(exc))
+            continue
+        k = key(item)
+        if k in valid:
+            prev_index, prev = valid[k]
+            results[prev_index] = _error(prev_index, prev.client_id, f"superseded by item {index} in the same batch")
+        valid[k] = (index, item)
+    return valid
+
+
+def _summarize(results: list[Optional[BatchItemResult]]) -> dict[str, Any]:
+    final = [r for r in results if r is not None]
+    return {
+        "created": sum(r.status == "created" for r in final),
+        "updated": sum(r.status == "updated" for r in final),
+        "failed": sum(r.status == "error" for r in final),
+        "results": final,
+    }
+
+
+async def upsert_journals(db: AsyncSession, user_id: int, raw_items: Sequence[Any]) -> dict[str, Any]:
+    results: list[Optional[BatchItemResult]] = [None] * len(raw_items)
+    valid = _validate(raw_items, JournalBatchItem, lambda item: item.client_id, results)
+    if valid:
+        existing = set(
+            await db.scalars(
+                select(Journal.client_id).where(Journal.user_id == user_id, Journal.client_id.in_(list(valid)))
+            )
+        )
+        now = utcnow()
+        rows = []
+        for client_id, (_, item) in valid.items():
+            created_at = item.created_at or now
+            rows.append(
+                {
+                    "user_id": user_id,
+                    "client_id": client_id,
+                    "title": item.title,
+                    "content": item.content,
+                    "tags": item.tags,
+                    "created_at": created_at,
+                }
+            )
+        stmt = dialect_insert(db, Journal).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Journal.user_id, Journal.client_id],
+            set_={"title": stmt.excluded.title, "content": stmt.excluded.content, "tags": stmt.excluded.tags},
+        ).returning(Journal.id, Journal.client_id, Journal.title, Journal.created_at)
+        created, updated = [], []
+        tags_by_journal = {}
+        for row in (await db.execute(stmt)).all():
+            index, item = valid[row.client_id]
+            tags_by_journal[row.id] = item.tags
+            status = "updated" if row.client_id in existing else "created"
+            results[index] = BatchItemResult(index=index, client_id=row.client_id, status=status, id=row.id)
+            (created if status == "created" else updated).append(row)
+        await search_service.set_tags(db, user_id, tags_by_journal)
+        await home_service.on_journals_written(db, user_id, created, updated)
+    return _summarize(results)
+
+
+async def upsert_mission_progress(db: AsyncSession, user_id: int, raw_items: Sequence[Any]) -> dict[str, Any]:
+    results: list[Optional[BatchItemResult]] = [None] * len(raw_items)
+    valid = _validate(raw_items, MissionProgressBatchItem, lambda item: item.mission_id, results)
+    if valid:
+        rewards = dict(
+            (await db.execute(select(Mission.id, Mission.reward_card_id).where(Mission.id.in_(list(valid))))).all()
+        )
+        for mission_id in [m for m in valid if m not in rewards]:
+            index, item = valid.pop(mission_id)
+            results[index] = _error(index, item.client_id, "mission not found")
+    if valid:
+        previous = dict(
+            (
+                await db.execute(
+                    select(MissionProgress.mission_id, MissionProgress.completed).where(
+                        MissionProgress.user_id == user_id, MissionProgress.mission_id.in_(list(valid))
+                    )
+                )
+            ).all()
+        )
+        now = utcnow()
+        stmt = dialect_insert(db, MissionProgress).values(
+            [
+                {
+                    "user_id": user_id,
+                    "mission_id": mission_id,
+                    "progress": item.progress,
+                    "completed": item.completed,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for mission_id, (_, item) in valid.items()
+            ]
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[MissionProgress.user_id, MissionProgress.mission_id],
+            set_={
+                "progress": stmt.excluded.progress,
+                "completed": stmt.excluded.completed,
+                "updated_at": stmt.excluded.updated_at,
+            },
+        ).returning(MissionProgress.id, MissionProgress.mission_id)
+        for row in (await db.execute(stmt)).all():
+            index, item = valid[row.mission_id]
+            status = "updated" if row.mission_id in previous else "created"
+            results[index] = BatchItemResult(index=index, client_id=item.client_id, status=status, id=row.id)
+
+        unlocks = [
+            {"user_id": user_id, "card_id": rewards[mission_id], "unlocked_at": now}
+            for mission_id, (_, item) in valid.items()
+            if item.completed and not previous.get(mission_id) and rewards[mission_id] is not None
+        ]
+        if unlocks:
+            ins = dialect_insert(db, UserCard).values(unlocks)
+            await db.execute(ins.on_conflict_do_nothing(index_elements=[UserCard.user_id, UserCard.card_id]))
+        await home_service.on_mission_progress_batch(
+            db, user_id, [(previous.get(mission_id), item.completed) for mission_id, (_, item) in valid.items()]
+        )
+    return _summarize(results)
@@ -0,0 +1,270 @@
+# services/api/services/home_service.py
+# 首頁 feed：讀取預先維護的 user_summaries，加上少量仍需即時的查詢
+#
+# - 寫入日記 / 任務進度時，在同一個 transaction 裡增量更新摘要（on_journal_written /
+#   on_mission_progress），首頁不必每次重算 streak 或掃 journals
+# - rebuild_summary() 從來源表整筆重算；背景 summary_refresh_loop 定期跑一輪校正漂移
+# - streak 的日期依 APP_TIMEZONE 切分（重算與增量路徑一致），不是 UTC 日期
+# - build_home() 把摘要與「進行中任務」「新解鎖卡片」三個查詢用各自的 session 並行執行；
+#   任務只即時查最近更新的幾筆，進行中 / 已完成的總數取自摘要
+import asyncio
+import logging
+from datetime import date, timedelta
+from typing import Any, Iterable, Optional, Sequence
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from services.api.config import settings
+from services.api.database import SessionLocal, dialect_insert, local_date, local_date_sql, local_today, utcnow
+from services.api.models.card import Card
+from services.api.models.journal import Journal
+from services.api.models.mission import Mission
+from services.api.models.mission_progress import MissionProgress
+from services.api.models.user import User
+from services.api.models.user_card import UserCard
+from services.api.models.user_summary import UserSummary
+
+logger = logging.getLogger(__name__)
+
+RECENT_JOURNALS = 5
+ACTIVE_MISSIONS = 5
+NEW_CARDS = 5
+NEW_CARD_DAYS = 7
+REFRESH_BATCH = 500
+
+
+def _snapshot(journal: Journal) -> dict[str, Any]:
+    return {"id": journal.id, "title": journal.title, "created_at": journal.created_at.isoformat()}
+
+
+def _streaks(days: list[date]) -> tuple[int, int]:
+    """days 為由新到舊、不重複的日期；回傳（以最後一天為終點的連續天數, 最長連續天數）。"""
+    if not days:
+        return 0, 0
+    current = longest = run = 1
+    counting_current = True
+    for newer, older in zip(days, days[1:]):
+        if newer - older == timedelta(days=1):
+            run += 1
+        else:
+            counting_current = False
+            run = 1
+        if counting_current:
+            current = run
+        longest = max(longest, run)
+    return current, longest
+
+
+async def _locked_summary(db: AsyncSession, user_id: int) -> Optional[UserSummary]:
+    # 同一使用者同時寫入時避免互相覆蓋（SQLite 會忽略 FOR UPDATE，本來就是單一 writer）
+    stmt = select(UserSummary).where(UserSummary.user_id == user_id).with_for_update()
+    return await db.scalar(stmt)
+
+
+async def _compute_summary(db: AsyncSession, user_id: int) -> dict[str, Any]:
+    """從來源表算出摘要各欄位的值（唯讀）。"""
+    day_col = local_date_sql(db, Journal.created_at)
+    raw_days = await db.scalars(
+        select(day_col).where(Journal.user_id == user_id).group_by(day_col).order_by(day_col.desc())
+    )
+    days = [d if isinstance(d, date) else date.fromisoformat(str(d)) for d in raw_days]
+    current, longest = _streaks(days)
+    journal_count = await db.scalar(select(func.count()).select_from(Journal).where(Journal.user_id == user_id))
+    recent = await db.scalars(
+        select(Journal)
+        .where(Journal.user_id == user_id)
+        .order_by(Journal.created_at.desc(), Journal.id.desc())
+        .limit(RECENT_JOURNALS)
+    )
+    mission_counts = dict(
+        (
+            await db.execute(
+                select(MissionProgress.completed, func.count())
+                .where(MissionProgress.user_id == user_id)
+                .group_by(MissionProgress.completed)
+            )
+        ).all()
+    )
+    return {
+        "journal_count": journal_count or 0,
+        "streak_days": current,
+        "longest_streak": longest,
+        "last_journal_date": days[0] if days else None,
+        "recent_journals": [_snapshot(j) for j in recent],
+        "active_missions": mission_counts.get(False, 0),
+        "completed_missions": mission_counts.get(True, 0),
+    }
+
+
+async def rebuild_summary(db: AsyncSession, user_id: int) -> UserSummary:
+    """從來源表重算一位使用者的摘要（呼叫端負責 commit）。"""
+    summary = await _locked_summary(db, user_id)
+    if summary is None:
+        # 同一使用者第一次載入首頁與寫入同時發生時，兩邊各自 INSERT 會撞主鍵；ON CONFLICT DO NOTHING
+        # 讓後到的等前一個 commit 後直接略過，再由 FOR UPDATE 依序重算。列已存在時不做任何寫入，
+        # 值沒有變的欄位 flush 時也不會 UPDATE（SQLite 只在真的有漂移時才拿寫入鎖）
+        await db.execute(
+            dialect_insert(db, UserSummary).values(user_id=user_id).on_conflict_do_nothing(index_elements=["user_id"])
+        )
+        summary = await _locked_summary(db, user_id)
+    for name, value in (await _compute_summary(db, user_id)).items():
+        setattr(summary, name, value)
+    await db.flush()
+    return summary
+
+
+async def on_journal_written(db: AsyncSession, journal: Journal) -> None:
+    """新日記已 flush 後呼叫；與日記在同一個 transaction 更新摘要。"""
+    await on_journals_written(db, journal.user_id, [journal])
+
+
+async def on_journals_written(
+    db: AsyncSession, user_id: int, journals: Sequence[Any], updated: Sequence[Any] = ()
+) -> None:
+    """批次版本；journals 為新增的日記，updated 為被覆寫的既有日記（只影響快照標題）。
+
+    項目只需有 id、title、created_at，ORM 物件或 RETURNING 的 row 皆可。
+    """
+    if not journals and not updated:
+        return
+    journals = sorted(journals, key=lambda j: (j.created_at, j.id))
+    summary = await _locked_summary(db, user_id)
+    backdated = (
+        summary is not None
+        and journals
+        and summary.last_journal_date is not None
+        and local_date(journals[0].created_at) < summary.last_journal_date
+    )
+    if summary is None or backdated:
+        # 尚無摘要，或離線補登較舊的日記會影響 streak，整筆重算
+        await rebuild_summary(db, user_id)
+        return
+    for journal in journals:
+        day = local_date(journal.created_at)
+        last = summary.last_journal_date
+        if last is None or day > last:
+            summary.streak_days = summary.streak_days + 1 if last == day - timedelta(days=1) else 1
+            summary.longest_streak = max(summary.longest_streak, summary.streak_days)
+            summary.last_journal_date = day
+    summary.journal_count += len(journals)
+    replaced = {j.id: _snapshot(j) for j in updated}
+    recent = [replaced.get(j["id"], j) for j in summary.recent_journals]
+    recent += [_snapshot(j) for j in journals]
+    recent.sort(key=lambda j: (j["created_at"], j["id"]), reverse=True)
+    # JSON 欄位要重新指派才會被視為變更
+    summary.recent_journals = recent[:RECENT_JOURNALS]
+
+
+async def on_mission_progress(
+    db: AsyncSession, user_id: int, was_completed: Optional[bool], completed: bool
+) -> None:
+    """was_completed 為 None 表示這是新建立的進度。"""
+    await on_mission_progress_batch(db, user_id, [(was_completed, completed)])
+
+
+async def on_mission_progress_batch(
+    db: AsyncSession, user_id: int, transitions: Iterable[tuple[Optional[bool], bool]]
+) -> None:
+    active = completed_delta = 0
+    for was_completed, completed in transitions:
+        if was_completed == completed:
+            continue
+        if was_completed is None:
+            active += 0 if completed else 1
+            completed_delta += 1 if completed else 0
+        elif completed:
+            active -= 1
+            completed_delta += 1
+        else:
+            active += 1
+            completed_delta -= 1
+    if not active and not completed_delta:
+        return
+    summary = await _locked_summary(db, user_id)
+    if summary is None:
+        await rebuild_summary(db, user_id)
+        return
+    summary.active_missions += active
+    summary.completed_missions += completed_delta
+
+
+async def refresh_all_summaries() -> int:
+    """整批重算所有使用者的摘要；每位使用者各自一個短 transaction，不會整批持有鎖。"""
+    refreshed = 0
+    last_id = 0
+    while True:
+        async with SessionLocal() as db:
+            user_ids = list(
+                await db.scalars(select(User.id).where(User.id > last_id).order_by(User.id).limit(REFRESH_BATCH))
+            )
+            await db.commit()
+            if not user_ids:
+                return refreshed
+            for user_id in user_ids:
+                await rebuild_summary(db, user_id)
+                await db.commit()
+        refreshed += len(user_ids)
+        last_id = user_ids[-1]
+
+
+async def summary_refresh_loop(interval: float = settings.home_summary_refresh_interval) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await refresh_all_summaries()
+        except Exception:
+            logger.exception("home summary refresh failed")
+
+
+async def _load_summary(user_id: int) -> UserSummary:
+    async with SessionLocal() as db:
+        summary = await db.get(UserSummary, user_id)
+        if summary is None:
+            summary = await rebuild_summary(db, user_id)
+            await db.commit()
+        return summary
+
+
+async def _active_missions(user_id: int) -> list[dict[str, Any]]:
+    async with SessionLocal() as db:
+        rows = await db.execute(
+            select(MissionProgress.mission_id, Mission.title, MissionProgress.progress, MissionProgress.updated_at)
+            .join(Mission, Mission.id == MissionProgress.mission_id)
+            .where(MissionProgress.user_id == user_id, MissionProgress.completed.is_(False))
+            .order_by(MissionProgress.updated_at.desc())
+            .limit(ACTIVE_MISSIONS)
+        )
+        return [dict(row._mapping) for row in rows]
+
+
+async def _new_cards(user_id: int) -> list[dict[str, Any]]:
+    since = utcnow() - timedelta(days=NEW_CARD_DAYS)
+    async with SessionLocal() as db:
+        rows = await db.execute(
+            select(UserCard.card_id, Card.code, Card.name, UserCard.unlocked_at)
+            .join(Card, Card.id == UserCard.card_id)
+            .where(UserCard.user_id == user_id, UserCard.unlocked_at >= since)
+            .order_by(UserCard.unlocked_at.desc())
+            .limit(NEW_CARDS)
+        )
+        return [dict(row._mapping) for row in rows]
+
+
+async def build_home(user_id: int) -> dict[str, Any]:
+    summary, missions, cards = await asyncio.gather(
+        _load_summary(user_id), _active_missions(user_id), _new_cards(user_id)
+    )
+    # 最後一篇日記早於昨天時，連續紀錄已中斷
+    last = summary.last_journal_date
+    current = summary.streak_days if last is not None and last >= local_today() - timedelta(days=1) else 0
+    return {
+        "user_id": user_id,
+        "journal_count": summary.journal_count,
+        "streak": {"current": current, "longest": summary.longest_streak, "last_journal_date": last},
+        "recent_journals": summary.recent_journals,
+        "active_missions": missions,
+        "active_mission_count": summary.active_missions,
+        "new_cards": cards,
+        "completed_missions": summary.completed_missions,
+    }
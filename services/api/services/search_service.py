@@ -0,0 +1,191 @@
+# services/api/services/search_service.py
+# 日記全文 / 標籤搜尋
+#
+# - 兩個後端都以字元二連組建索引（見 models/journal.py），中文不需要斷詞，兩字詞也走索引
+# - PostgreSQL：以 lower(col) LIKE '%詞%' 比對；有 pg_bigm 時走其 GIN 索引、排名用 bigm_similarity，
+#   退而求其次用 pg_trgm（word_similarity），兩者都沒有時全表 LIKE、排名為命中詞數（見 models/journal.py）
+# - SQLite：FTS5 表 journals_fts，token 已帶使用者前綴；兩字以上的詞查相鄰二連組組成的 phrase，
+#   單字查前綴，排名用 bm25
+# - 全文索引由 DB 在寫入時維護（GIN 索引 / models/journal.py 的 trigger）；標籤表由 set_tags() 在同一個
+#   transaction 內更新
+# - 有相關度時依 (rank DESC, id DESC) 做 keyset 分頁，游標記錄上一頁最後一筆的 (rank, id)；
+#   只篩標籤（或詞裡沒有任何文字、數字可建索引）時沒有相關度可排，沿用一般列表的 (created_at, id) 分頁
+from typing import Optional, Sequence
+
+from sqlalchemy import (
+    Float,
+    Select,
+    and_,
+    case,
+    cast,
+    column,
+    delete,
+    func,
+    insert,
+    literal_column,
+    or_,
+    select,
+    table,
+    text,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from services.api.models.journal import POSTGRES_SEARCH_OPCLASSES, Journal, search_token_runs
+from services.api.models.journal_tag import JournalTag
+from services.api.pagination import PageParams, decode_rank_cursor, encode_rank_cursor, fetch_page
+
+MAX_TERMS = 8
+# 標題命中的權重（相對於內文）
+TITLE_WEIGHT = 2.0
+
+journals_fts = table("journals_fts", column("rowid"), column("title"), column("content"))
+
+# PostgreSQL 已安裝的搜尋 extension（pg_bigm / pg_trgm / None），每個行程第一次搜尋時查一次
+_UNKNOWN = object()
+_pg_extension = _UNKNOWN
+
+
+def parse_terms(q: Optional[str]) -> list[str]:
+    """以空白切詞、去重；詞之間是 AND。"""
+    terms: dict[str, None] = {}
+    for term in (q or "").split():
+        terms[term] = None
+    return list(terms)[:MAX_TERMS]
+
+
+def _like_pattern(term: str) -> str:
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _contains(term: str, lower: bool = False):
+    if lower:
+        pattern = _like_pattern(term.lower())
+        title, content = func.lower(Journal.title), func.lower(Journal.content)
+    else:
+        pattern = _like_pattern(term)
+        title, content = Journal.title, Journal.content
+    return or_(title.like(pattern, escape="\\"), content.like(pattern, escape="\\"))
+
+
+def _fts_phrase(text: str) -> str:
+    return '"' + text.replace('"', '""') + '"'
+
+
+def _fts_query(user_id: int, term: str) -> Optional[str]:
+    """把一個詞轉成 FTS5 查詢；詞裡沒有任何文字、數字時回傳 None。
+
+    詞內的標點視為分隔，各片段之間是 AND（例如 "C++" 只查 "C"）。
+    """
+    prefix = f"{user_id}x"
+    parts = []
+    for run in search_token_runs(term):
+        if len(run) == 1:
+            parts.append(_fts_phrase(prefix + run) + "*")
+        else:
+            parts.append(_fts_phrase(" ".join(prefix + run[i : i + 2] for i in range(len(run) - 1))))
+    return " ".join(parts) or None
+
+
+async def _postgres_extension(db: AsyncSession) -> Optional[str]:
+    global _pg_extension
+    if _pg_extension is _UNKNOWN:
+        installed = set(
+            await db.scalars(text("SELECT extname FROM pg_extension WHERE extname IN ('pg_bigm', 'pg_trgm')"))
+        )
+        _pg_extension = next((name for name in POSTGRES_SEARCH_OPCLASSES if name in installed), None)
+    return _pg_extension
+
+
+def _postgres_score(col, query: str, terms: list[str], extension: Optional[str]):
+    if extension == "pg_bigm":
+        return func.bigm_similarity(query, func.lower(col))
+    if extension == "pg_trgm":
+        return func.word_similarity(query, func.lower(col))
+    # 沒有相似度函式：以命中的詞數當分數
+    return sum(
+        case((func.lower(col).like(_like_pattern(term.lower()), escape="\\"), 1.0), else_=0.0) for term in terms
+    )
+
+
+def _postgres_match(stmt: Select, terms: list[str], extension: Optional[str]):
+    for term in terms:
+        stmt = stmt.where(_contains(term, lower=True))
+    query = " ".join(terms).lower()
+    # 統一轉成 double precision：real / numeric 轉成 Python float 再回傳時，游標比較才不會有誤差
+    rank = cast(
+        TITLE_WEIGHT * _postgres_score(Journal.title, query, terms, extension)
+        + _postgres_score(Journal.content, query, terms, extension),
+        Float,
+    )
+    return stmt, rank
+
+
+def _sqlite_match(stmt: Select, user_id: int, terms: list[str]):
+    queries = []
+    for term in terms:
+        query = _fts_query(user_id, term)
+        if query is None:
+            stmt = stmt.where(_contains(term))
+        else:
+            queries.append(query)
+    if not queries:
+        return stmt, None
+    stmt = stmt.join(journals_fts, journals_fts.c.rowid == Journal.id).where(
+        literal_column("journals_fts").match(" ".join(queries))
+    )
+    # bm25 越小越相關，取負值讓兩個後端都是「越大越相關」
+    rank = -func.bm25(literal_column("journals_fts"), TITLE_WEIGHT, 1.0)
+    return stmt, rank
+
+
+def _tagged(user_id: int, tags: Sequence[str]) -> Select:
+    # 必須同時帶有所有指定標籤（uq_journal_tags_journal_tag 保證同一篇不會重複計數）
+    return (
+        select(JournalTag.journal_id)
+        .where(JournalTag.user_id == user_id, JournalTag.tag.in_(tags))
+        .group_by(JournalTag.journal_id)
+        .having(func.count() == len(tags))
+    )
+
+
+async def search_journals(
+    db: AsyncSession, user_id: int, q: Optional[str], tags: Sequence[str], params: PageParams
+) -> tuple[list[Journal], Optional[str]]:
+    stmt = select(Journal).where(Journal.user_id == user_id)
+    if tags:
+        stmt = stmt.where(Journal.id.in_(_tagged(user_id, tags)))
+    terms = parse_terms(q)
+    rank = None
+    if terms and db.get_bind().dialect.name == "postgresql":
+        stmt, rank = _postgres_match(stmt, terms, await _postgres_extension(db))
+    elif terms:
+        stmt, rank = _sqlite_match(stmt, user_id, terms)
+    if rank is None:
+        return await fetch_page(db, stmt, Journal, params)
+
+    if params.cursor:
+        last_rank, last_id = decode_rank_cursor(params.cursor)
+        stmt = stmt.where(or_(rank < last_rank, and_(rank == last_rank, Journal.id < last_id)))
+    stmt = stmt.add_columns(rank.label("rank")).order_by(rank.desc(), Journal.id.desc()).limit(params.limit + 1)
+    # 相關度會隨其他寫入（bm25 的全域統計）變動，翻頁期間有新日記時頁與頁之間可能略有重疊或遺漏
+    result = (await db.execute(stmt)).all()
+    next_cursor = None
+    if len(result) > params.limit:
+        result = result[: params.limit]
+        next_cursor = encode_rank_cursor(result[-1].rank, result[-1].Journal.id)
+    return [row.Journal for row in result], next_cursor
+
+
+async def set_tags(db: AsyncSession, user_id: int, tags_by_journal: dict[int, Sequence[str]]) -> None:
+    """以 Journal.tags 為準重建這些日記的標籤索引（呼叫端負責 commit）。"""
+    if not tags_by_journal:
+        return
+    await db.execute(delete(JournalTag).where(JournalTag.journal_id.in_(list(tags_by_journal))))
+    rows = [
+        {"journal_id": journal_id, "user_id": user_id, "tag": tag}
+        for journal_id, tags in tags_by_journal.items()
+        for tag in tags
+    ]
+    if rows:
+        await db.execute(insert(JournalTag), rows)
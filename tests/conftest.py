@@ -0,0 +1,26 @@
+# tests/conftest.py
+# 需要資料庫的測試共用的 SQLite 暫存 DB（不動 services.api.database 的全域 engine）
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+import services.api.models  # noqa: F401  確保所有 model 都註冊到 Base.metadata
+from services.api.database import Base, register_sqlite_functions
+
+
+@pytest.fixture
+def sessions(tmp_path):
+    """每個測試一個全新的 SQLite 檔案 DB（已建表、註冊 jq_* 函式），回傳 async_sessionmaker。"""
+    # 測試以 asyncio.run() 執行，每次都是新的 event loop，連線不能跨 loop 重用
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}", poolclass=NullPool)
+    register_sqlite_functions(engine.sync_engine)
+
+    async def create_all():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    asyncio.run(create_all())
+    yield async_sessionmaker(engine, expire_on_commit=False, autoflush=False)
+    asyncio.run(engine.dispose())
@@ -0,0 +1,267 @@
+# tests/test_auth.py
+# services/api/services/auth_service.py：BloomFilter、ClaimsCache、RevocationList 增量同步 / 重建、
+# refresh token 輪替與 _decode 的拒絕條件
+#
+#   python -m pytest -q tests
+import asyncio
+from datetime import timedelta
+from types import SimpleNamespace
+
+import jwt
+import pytest
+from fastapi import HTTPException
+
+from services.api.database import utcnow
+from services.api.models.tokens import RefreshToken
+from services.api.models.user import User
+from services.api.services import auth_service
+from services.api.services.auth_service import SYNC_OVERLAP, BloomFilter, ClaimsCache, RevocationList
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+# ---------------------------------------------------------------- BloomFilter
+def test_bloom_has_no_false_negatives_and_bounded_false_positives():
+    bloom = BloomFilter(capacity=2000, fp_rate=0.01)
+    members = [f"jti-{i}" for i in range(2000)]
+    for item in members:
+        bloom.add(item)
+    assert all(item in bloom for item in members)
+    assert bloom.count == 2000
+    probes = 20_000
+    false_positives = sum(f"other-{i}" in bloom for i in range(probes))
+    # 填到設計容量時誤判率應接近 fp_rate，留一倍餘裕
+    assert false_positives / probes < 0.02
+
+
+def test_bloom_empty_filter_contains_nothing():
+    bloom = BloomFilter(capacity=10, fp_rate=0.001)
+    assert "anything" not in bloom
+
+
+# ---------------------------------------------------------------- ClaimsCache
+@pytest.fixture
+def clock(monkeypatch):
+    now = SimpleNamespace(value=1_000_000.0)
+    monkeypatch.setattr(auth_service, "time", SimpleNamespace(time=lambda: now.value))
+    return now
+
+
+def test_claims_cache_expires_with_token(clock):
+    cache = ClaimsCache(max_size=10)
+    cache.put("t", {"exp": clock.value + 30})
+    assert cache.get("t") == {"exp": clock.value + 30}
+    clock.value += 30
+    assert cache.get("t") is None
+    assert "t" not in cache._data
+
+
+def test_claims_cache_evicts_least_recently_used(clock):
+    cache = ClaimsCache(max_size=2)
+    claims = {"exp": clock.value + 60}
+    cache.put("a", claims)
+    cache.put("b", claims)
+    cache.get("a")
+    cache.put("c", claims)
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+
+
+def test_claims_cache_disabled_with_zero_size(clock):
+    cache = ClaimsCache(max_size=0)
+    cache.put("a", {"exp": clock.value + 60})
+    assert cache.get("a") is None
+
+
+# ---------------------------------------------------------------- RevocationList
+def _seed_user(sessions) -> None:
+    async def seed():
+        async with sessions() as db:
+            db.add(User(id=1, email="u@example.com"))
+            await db.commit()
+
+    run(seed())
+
+
+def _add_tokens(sessions, tokens: dict[str, object]) -> None:
+    """tokens: jti -> revoked_at（None 表示未撤銷）；全部在一小時後到期。"""
+
+    async def add():
+        async with sessions() as db:
+            expires_at = utcnow() + timedelta(hours=1)
+            db.add_all(
+                RefreshToken(jti=jti, user_id=1, expires_at=expires_at, revoked_at=revoked_at)
+                for jti, revoked_at in tokens.items()
+            )
+            await db.commit()
+
+    run(add())
+
+
+def _sync(sessions, revocations: RevocationList, db_wrapper=None) -> int:
+    async def sync():
+        async with sessions() as db:
+            return await revocations.sync(db_wrapper(db) if db_wrapper else db)
+
+    return run(sync())
+
+
+def test_revocation_first_sync_rebuilds_from_unexpired_revocations(sessions):
+    _seed_user(sessions)
+    now = utcnow()
+    _add_tokens(sessions, {"old": now - timedelta(minutes=5), "new": now - timedelta(minutes=1), "live": None})
+
+    async def expire_old():
+        # 已過期的 refresh token 不可能再被使用，重建時不載入
+        async with sessions() as db:
+            db.add(RefreshToken(jti="expired", user_id=1, expires_at=now - timedelta(minutes=1), revoked_at=now))
+            await db.commit()
+
+    run(expire_old())
+    revocations = RevocationList(capacity=100, fp_rate=0.001)
+    assert _sync(sessions, revocations) == 2
+    assert revocations.might_be_revoked("old") and revocations.might_be_revoked("new")
+    assert not revocations.might_be_revoked("live") and not revocations.might_be_revoked("expired")
+    assert revocations.watermark == now - timedelta(minutes=1)
+
+
+def test_revocation_sync_without_revocations_sets_watermark(sessions):
+    revocations = RevocationList(capacity=100, fp_rate=0.001)
+    before = utcnow()
+    assert _sync(sessions, revocations) == 0
+    assert revocations.watermark >= before
+
+
+def test_revocation_incremental_sync_advances_watermark_with_overlap(sessions):
+    _seed_user(sessions)
+    now = utcnow()
+    _add_tokens(sessions, {"first": now - timedelta(minutes=10)})
+    revocations = RevocationList(capacity=100, fp_rate=0.001)
+    _sync(sessions, revocations)
+    watermark = revocations.watermark
+    rebuilt = revocations.bloom
+
+    _add_tokens(
+        sessions,
+        {
+            # 在上次同步之後才 commit、但 revoked_at 早於水位線（仍在 SYNC_OVERLAP 內）
+            "late-commit": watermark - SYNC_OVERLAP / 2,
+            # 比重疊區間更早，增量同步不會再讀
+            "too-old": watermark - SYNC_OVERLAP * 2,
+            "newest": now,
+        }
+    )
+    assert _sync(sessions, revocations) == 2
+    # 增量同步沿用同一個 filter，不重建
+    assert revocations.bloom is rebuilt
+    assert revocations.might_be_revoked("late-commit") and revocations.might_be_revoked("newest")
+    assert not revocations.might_be_revoked("too-old")
+    assert revocations.watermark == now
+    # 重疊區間內已在 filter 裡的 jti 不重複計入
+    assert _sync(sessions, revocations) == 0
+
+
+def test_revocation_full_filter_triggers_rebuild_with_larger_capacity(sessions):
+    _seed_user(sessions)
+    now = utcnow()
+    _add_tokens(sessions, {f"jti-{i}": now - timedelta(seconds=i) for i in range(3)})
+    revocations = RevocationList(capacity=2, fp_rate=0.001)
+    _sync(sessions, revocations)
+    # 撤銷數超過設定容量：依實際筆數留一倍餘裕
+    assert revocations.bloom.capacity == 6
+
+    revocations.add("local-1")
+    revocations.add("local-2")
+    revocations.add("local-3")
+    assert revocations.bloom.count >= revocations.bloom.capacity
+    old_bloom = revocations.bloom
+    assert _sync(sessions, revocations) == 3
+    assert revocations.bloom is not old_bloom
+    assert all(revocations.might_be_revoked(f"jti-{i}") for i in range(3))
+
+
+def test_revocation_rebuild_keeps_jtis_revoked_during_the_query(sessions):
+    _seed_user(sessions)
+    _add_tokens(sessions, {"stored": utcnow()})
+    revocations = RevocationList(capacity=100, fp_rate=0.001)
+
+    class RevokeWhileQuerying:
+        """重建查詢進行中，同一進程的另一個請求撤銷了 token。"""
+
+        def __init__(self, db):
+            self.db = db
+
+        async def execute(self, stmt):
+            revocations.add("during-rebuild")
+            return await self.db.execute(stmt)
+
+    _sync(sessions, revocations, RevokeWhileQuerying)
+    assert revocations.might_be_revoked("stored") and revocations.might_be_revoked("during-rebuild")
+    assert revocations._pending is None
+
+
+# ---------------------------------------------------------------- token
+@pytest.fixture
+def fresh_revocations(monkeypatch):
+    revocations = RevocationList(capacity=100, fp_rate=0.001)
+    monkeypatch.setattr(auth_service, "revocations", revocations)
+    return revocations
+
+
+def test_rotate_refresh_token_rejects_reuse(sessions, fresh_revocations):
+    _seed_user(sessions)
+
+    async def scenario():
+        async with sessions() as db:
+            tokens = await auth_service.issue_tokens(db, 1)
+            await db.commit()
+        async with sessions() as db:
+            rotated = await auth_service.rotate_refresh_token(db, tokens["refresh_token"])
+            await db.commit()
+        async with sessions() as db:
+            with pytest.raises(HTTPException) as reused:
+                await auth_service.rotate_refresh_token(db, tokens["refresh_token"])
+        # 新的 refresh token 仍可使用
+        async with sessions() as db:
+            await auth_service.rotate_refresh_token(db, rotated["refresh_token"])
+            await db.commit()
+        return tokens, reused.value
+
+    tokens, error = run(scenario())
+    assert error.status_code == 401 and error.detail == "token revoked"
+    old_jti = jwt.decode(tokens["refresh_token"], options={"verify_signature": False})["jti"]
+    assert fresh_revocations.might_be_revoked(old_jti)
+
+
+def _signed(claims: dict, kid: str = None) -> str:
+    keys = auth_service.get_key_set()
+    active_kid, secret = keys.signing_key()
+    return jwt.encode(claims, secret, algorithm=keys.algorithm, headers={"kid": kid or active_kid})
+
+
+def _claims(**overrides) -> dict:
+    claims = {"sub": "1", "sid": "s", "type": "access", "exp": utcnow() + timedelta(minutes=5)}
+    claims.update(overrides)
+    return {k: v for k, v in claims.items() if v is not None}
+
+
+def test_decode_accepts_valid_token():
+    assert auth_service._decode(_signed(_claims()), "access")["sub"] == "1"
+
+
+@pytest.mark.parametrize(
+    "token",
+    [
+        pytest.param(lambda: _signed(_claims(), kid="unknown-kid"), id="wrong-kid"),
+        pytest.param(lambda: _signed(_claims(type="refresh")), id="wrong-type"),
+        pytest.param(lambda: _signed(_claims(exp=None)), id="missing-exp"),
+        pytest.param(lambda: _signed(_claims(exp=utcnow() - timedelta(seconds=1))), id="expired"),
+        pytest.param(lambda: _signed(_claims())[:-2] + "xx", id="bad-signature"),
+    ],
+)
+def test_decode_rejects(token):
+    with pytest.raises(HTTPException) as error:
+        auth_service._decode(token(), "access")
+    assert error.value.status_code == 401
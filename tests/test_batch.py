@@ -0,0 +1,178 @@
+# tests/test_batch.py
+# services/api/services/batch_service.py：離線同步的批次寫入——重送冪等、同批重複、逐筆驗證錯誤、
+# 任務完成時解鎖卡片與首頁摘要的同步更新
+#
+#   python -m pytest -q tests
+import asyncio
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import func, select
+
+from services.api.database import utcnow
+from services.api.models.card import Card
+from services.api.models.journal import Journal
+from services.api.models.journal_tag import JournalTag
+from services.api.models.mission import Mission
+from services.api.models.user import User
+from services.api.models.user_card import UserCard
+from services.api.models.user_summary import UserSummary
+from services.api.services import batch_service
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+@pytest.fixture
+def db(sessions):
+    async def seed():
+        async with sessions() as session:
+            session.add_all([User(id=1, email="u1@example.com"), User(id=2, email="u2@example.com")])
+            session.add_all([Card(id=10, code="temple", name="龍山寺"), Card(id=11, code="market", name="夜市")])
+            await session.flush()
+            session.add_all(
+                [
+                    Mission(id=1, title="參拜", reward_card_id=10),
+                    Mission(id=2, title="逛夜市", reward_card_id=11),
+                    Mission(id=3, title="散步", reward_card_id=None),
+                ]
+            )
+            await session.commit()
+
+    run(seed())
+    return sessions
+
+
+def _call(sessions, fn, user_id: int, items: list) -> dict:
+    async def call():
+        async with sessions() as session:
+            result = await fn(session, user_id, items)
+            await session.commit()
+            return result
+
+    return run(call())
+
+
+def _scalar(sessions, stmt):
+    async def query():
+        async with sessions() as session:
+            return await session.scalar(stmt)
+
+    return run(query())
+
+
+def _statuses(result: dict) -> list[tuple]:
+    return [(r.index, r.client_id, r.status) for r in result["results"]]
+
+
+# ---------------------------------------------------------------- 日記
+def test_journal_retry_is_idempotent(db):
+    items = [
+        {"client_id": "a", "title": "第一篇", "tags": ["旅行"]},
+        {"client_id": "b", "title": "第二篇"},
+    ]
+    first = _call(db, batch_service.upsert_journals, 1, items)
+    assert (first["created"], first["updated"], first["failed"]) == (2, 0, 0)
+    # 網路中斷後整批重送：同一個 client_id 變成 updated，不會多出日記
+    items[0]["title"] = "第一篇（改）"
+    second = _call(db, batch_service.upsert_journals, 1, items)
+    assert (second["created"], second["updated"], second["failed"]) == (0, 2, 0)
+    assert [r.id for r in second["results"]] == [r.id for r in first["results"]]
+    assert _scalar(db, select(func.count()).select_from(Journal)) == 2
+    assert _scalar(db, select(Journal.title).where(Journal.client_id == "a")) == "第一篇（改）"
+    assert _scalar(db, select(func.count()).select_from(JournalTag)) == 1
+    summary = _scalar(db, select(UserSummary).where(UserSummary.user_id == 1))
+    assert summary.journal_count == 2
+    assert {j["title"] for j in summary.recent_journals} == {"第一篇（改）", "第二篇"}
+
+
+def test_journal_client_ids_are_scoped_per_user(db):
+    _call(db, batch_service.upsert_journals, 1, [{"client_id": "a", "title": "u1"}])
+    result = _call(db, batch_service.upsert_journals, 2, [{"client_id": "a", "title": "u2"}])
+    assert result["created"] == 1
+    assert _scalar(db, select(func.count()).select_from(Journal)) == 2
+
+
+def test_journal_duplicate_in_same_batch_is_superseded(db):
+    result = _call(
+        db,
+        batch_service.upsert_journals,
+        1,
+        [{"client_id": "a", "title": "舊"}, {"client_id": "b"}, {"client_id": "a", "title": "新"}],
+    )
+    assert _statuses(result) == [(0, "a", "error"), (1, "b", "created"), (2, "a", "created")]
+    assert result["results"][0].error == "superseded by item 2 in the same batch"
+    assert _scalar(db, select(Journal.title).where(Journal.client_id == "a")) == "新"
+
+
+def test_journal_invalid_items_fail_individually(db):
+    future = (utcnow() + timedelta(days=1)).isoformat()
+    result = _call(
+        db,
+        batch_service.upsert_journals,
+        1,
+        [
+            {"client_id": "ok", "title": "好"},
+            {"title": "沒有 client_id"},
+            {"client_id": "long", "title": "x" * 201},
+            {"client_id": "future", "created_at": future},
+            "not an object",
+        ],
+    )
+    assert (result["created"], result["failed"]) == (1, 4)
+    assert _statuses(result) == [
+        (0, "ok", "created"),
+        (1, None, "error"),
+        (2, "long", "error"),
+        (3, "future", "error"),
+        (4, None, "error"),
+    ]
+    assert result["results"][1].error.startswith("client_id:")
+    assert result["results"][2].error.startswith("title:")
+    assert _scalar(db, select(func.count()).select_from(Journal)) == 1
+
+
+# ---------------------------------------------------------------- 任務進度
+def test_progress_retry_and_card_unlock(db):
+    items = [
+        {"client_id": "p1", "mission_id": 1, "progress": 100, "completed": True},
+        {"client_id": "p2", "mission_id": 2, "progress": 30},
+        {"client_id": "p3", "mission_id": 3, "progress": 100, "completed": True},
+    ]
+    first = _call(db, batch_service.upsert_mission_progress, 1, items)
+    assert (first["created"], first["updated"], first["failed"]) == (3, 0, 0)
+    # 完成的任務解鎖獎勵卡；沒有獎勵的任務不解鎖任何卡
+    assert _scalar(db, select(func.count()).select_from(UserCard)) == 1
+    assert _scalar(db, select(UserCard.card_id).where(UserCard.user_id == 1)) == 10
+
+    # 重送：全部變成 updated，卡片不重複解鎖
+    second = _call(db, batch_service.upsert_mission_progress, 1, items)
+    assert (second["created"], second["updated"]) == (0, 3)
+    assert _scalar(db, select(func.count()).select_from(UserCard)) == 1
+
+    # 之後完成任務 2：解鎖第二張卡，摘要的進行中 / 已完成數跟著移動
+    _call(db, batch_service.upsert_mission_progress, 1, [{"client_id": "p2", "mission_id": 2, "completed": True}])
+    assert _scalar(db, select(func.count()).select_from(UserCard)) == 2
+    summary = _scalar(db, select(UserSummary).where(UserSummary.user_id == 1))
+    assert (summary.active_missions, summary.completed_missions) == (0, 3)
+
+
+def test_progress_errors_are_per_item(db):
+    result = _call(
+        db,
+        batch_service.upsert_mission_progress,
+        1,
+        [
+            {"client_id": "a", "mission_id": 99},
+            {"client_id": "b", "mission_id": 1, "progress": 101},
+            {"client_id": "c", "mission_id": 2, "progress": 10},
+            {"client_id": "d", "mission_id": 2, "progress": 20},
+        ],
+    )
+    assert _statuses(result) == [(0, "a", "error"), (1, "b", "error"), (2, "c", "error"), (3, "d", "created")]
+    assert result["results"][0].error == "mission not found"
+    assert result["results"][1].error.startswith("progress:")
+    assert result["results"][2].error == "superseded by item 3 in the same batch"
+    summary = _scalar(db, select(UserSummary).where(UserSummary.user_id == 1))
+    assert (summary.active_missions, summary.completed_missions) == (1, 0)
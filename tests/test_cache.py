@@ -0,0 +1,321 @@
+# tests/test_cache.py
+# services/api/cache.py：LRUCache、RedisCache（以下方的 FakeRedis 代替）與 ResponseCacheMiddleware
+#
+#   python -m pytest -q tests
+import asyncio
+import fnmatch
+import json
+
+import pytest
+
+from services.api import cache as cache_module
+from services.api.cache import CacheEntry, LRUCache, RedisCache, ResponseCacheMiddleware
+
+
+class FakeClock:
+    """同時取代 time.monotonic() 與 time.time()，測試可以手動推進時間。"""
+
+    def __init__(self, start: float = 1_000_000.0):
+        self.now = start
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def time(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+class FakeRedis:
+    """RedisCache 用到的 redis.asyncio 指令子集；到期時間依 FakeClock 計算。"""
+
+    def __init__(self, clock: FakeClock):
+        self.clock = clock
+        self.data: dict[str, object] = {}
+        self.expires: dict[str, float] = {}
+
+    def _alive(self, name: str) -> bool:
+        expires_at = self.expires.get(name)
+        if expires_at is not None and expires_at <= self.clock.now:
+            self.data.pop(name, None)
+            self.expires.pop(name, None)
+        return name in self.data
+
+    async def get(self, name: str):
+        return self.data[name] if self._alive(name) else None
+
+    async def set(self, name: str, value: str, px: int = None):
+        self.data[name] = value.encode()
+        if px is not None:
+            self.expires[name] = self.clock.now + px / 1000
+        else:
+            self.expires.pop(name, None)
+
+    async def delete(self, *names: str) -> int:
+        removed = 0
+        for name in names:
+            if self._alive(name):
+                del self.data[name]
+                self.expires.pop(name, None)
+                removed += 1
+        return removed
+
+    async def incr(self, name: str) -> int:
+        value = int(await self.get(name) or 0) + 1
+        self.data[name] = str(value).encode()
+        return value
+
+    async def zadd(self, name: str, mapping: dict[str, float]) -> int:
+        self._alive(name)
+        zset = self.data.setdefault(name, {})
+        added = sum(1 for member in mapping if member not in zset)
+        zset.update(mapping)
+        return added
+
+    async def zrange(self, name: str, start: int, end: int) -> list[bytes]:
+        if not self._alive(name):
+            return []
+        members = sorted(self.data[name].items(), key=lambda kv: (kv[1], kv[0]))
+        stop = None if end == -1 else end + 1
+        return [member.encode() for member, _ in members[start:stop]]
+
+    async def zremrangebyscore(self, name: str, low, high) -> int:
+        if not self._alive(name):
+            return 0
+        low, high = float(low), float(high)
+        zset = self.data[name]
+        doomed = [member for member, score in zset.items() if low <= score <= high]
+        for member in doomed:
+            del zset[member]
+        return len(doomed)
+
+    async def pexpire(self, name: str, ms: int) -> bool:
+        if not self._alive(name):
+            return False
+        self.expires[name] = self.clock.now + ms / 1000
+        return True
+
+    async def scan_iter(self, match: str = "*"):
+        for name in list(self.data):
+            if self._alive(name) and fnmatch.fnmatchcase(name, match):
+                yield name
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    fake = FakeClock()
+    monkeypatch.setattr(cache_module, "time", fake)
+    return fake
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def entry(body: bytes = b'{"items":[]}', tags: tuple[str, ...] = ("cards",)) -> CacheEntry:
+    return CacheEntry(
+        status=200,
+        headers=[(b"content-type", b"application/json"), (b"etag", b'"e"')],
+        body=body,
+        etag='"e"',
+        tags=tags,
+        route="/cards/",
+    )
+
+
+# ---------------------------------------------------------------- LRUCache
+def test_lru_ttl(clock):
+    lru = LRUCache(ttl=10)
+    run(lru.set("k", entry()))
+    clock.advance(9)
+    assert run(lru.get("k")) is not None
+    clock.advance(2)
+    assert run(lru.get("k")) is None
+    assert lru.stats.entries == 0 and lru.stats.bytes == 0
+    assert (lru.stats.hits, lru.stats.misses) == (1, 1)
+
+
+def test_lru_evicts_least_recently_used(clock):
+    lru = LRUCache(max_entries=2)
+    run(lru.set("a", entry()))
+    run(lru.set("b", entry()))
+    run(lru.get("a"))
+    run(lru.set("c", entry()))
+    assert run(lru.get("b")) is None
+    assert run(lru.get("a")) is not None and run(lru.get("c")) is not None
+    assert lru.stats.evictions == 1
+
+
+def test_lru_evicts_by_bytes(clock):
+    lru = LRUCache(max_bytes=10)
+    run(lru.set("a", entry(b"12345")))
+    run(lru.set("b", entry(b"123456")))
+    assert run(lru.get("a")) is None
+    assert lru.stats.bytes == 6
+    # 單筆就超過上限的回應不收
+    run(lru.set("big", entry(b"x" * 11)))
+    assert run(lru.get("big")) is None
+
+
+def test_lru_invalidate_tags(clock):
+    lru = LRUCache()
+    run(lru.set("a", entry(tags=("cards",))))
+    run(lru.set("b", entry(tags=("missions",))))
+    assert run(lru.invalidate_tags("cards")) == 1
+    assert run(lru.get("a")) is None and run(lru.get("b")) is not None
+    assert lru.stats.invalidations == 1
+
+
+# ---------------------------------------------------------------- RedisCache
+def test_redis_roundtrip_and_ttl(clock):
+    redis = RedisCache(FakeRedis(clock), ttl=10)
+    original = entry()
+    run(redis.set("k", original))
+    assert run(redis.get("k")) == original
+    clock.advance(11)
+    assert run(redis.get("k")) is None
+    assert (redis.stats.hits, redis.stats.misses) == (1, 1)
+
+
+def test_redis_invalidate_tags(clock):
+    client = FakeRedis(clock)
+    redis = RedisCache(client, ttl=10)
+    run(redis.set("a", entry(tags=("cards",))))
+    run(redis.set("b", entry(tags=("missions",))))
+    assert run(redis.invalidate_tags("cards")) == 1
+    assert run(redis.get("a")) is None and run(redis.get("b")) is not None
+    assert "jq:cache:tag:cards" not in client.data
+
+
+def test_redis_tag_index_is_pruned_and_expires(clock):
+    client = FakeRedis(clock)
+    redis = RedisCache(client, ttl=10)
+    for i in range(5):
+        run(redis.set(f"old{i}", entry()))
+    clock.advance(11)
+    run(redis.set("new", entry()))
+    # 已過期的 key 在下一次寫入時從 tag 索引移除
+    assert run(client.zrange("jq:cache:tag:cards", 0, -1)) == [b"new"]
+    # 之後沒有寫入，tag 索引本身跟著最後一筆一起到期
+    clock.advance(11)
+    assert run(client.zrange("jq:cache:tag:cards", 0, -1)) == []
+    assert not any(client._alive(name) for name in list(client.data))
+
+
+def test_redis_clear_keeps_other_prefixes(clock):
+    client = FakeRedis(clock)
+    run(client.set("other:key", "x"))
+    redis = RedisCache(client, ttl=10)
+    run(redis.set("k", entry()))
+    run(redis.clear())
+    assert list(client.data) == ["other:key"]
+
+
+# ---------------------------------------------------------------- middleware
+class CountingApp:
+    def __init__(self, body: bytes = b'{"items":[1]}', content_type: bytes = b"application/json"):
+        self.calls = 0
+        self.body = body
+        self.content_type = content_type
+
+    async def __call__(self, scope, receive, send):
+        self.calls += 1
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", self.content_type)]})
+        await send({"type": "http.response.body", "body": self.body})
+
+
+def request(app, path: str = "/cards/", query: bytes = b"", headers: list = (), method: str = "GET") -> dict:
+    scope = {"type": "http", "method": method, "path": path, "query_string": query, "headers": list(headers)}
+    sent: list[dict] = []
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        sent.append(message)
+
+    run(app(scope, receive, send))
+    start = sent[0]
+    return {
+        "status": start["status"],
+        "headers": dict(start["headers"]),
+        "body": b"".join(m.get("body", b"") for m in sent[1:]),
+    }
+
+
+@pytest.mark.parametrize("backend", ["lru", "redis"])
+def test_middleware_etag_and_304(clock, backend):
+    store = LRUCache() if backend == "lru" else RedisCache(FakeRedis(clock))
+    inner = CountingApp()
+    app = ResponseCacheMiddleware(inner, rules={"/cards": "cards"}, cache=store)
+
+    first = request(app)
+    etag = first["headers"][b"etag"]
+    assert first["status"] == 200 and first["body"] == inner.body
+    second = request(app, headers=[(b"if-none-match", etag)])
+    assert second["status"] == 304 and second["body"] == b"" and second["headers"][b"etag"] == etag
+    assert inner.calls == 1
+    assert store.stats.not_modified == 1
+
+    run(store.invalidate_tags("cards"))
+    inner.body = b'{"items":[1,2]}'
+    third = request(app, headers=[(b"if-none-match", etag)])
+    assert third["status"] == 200 and third["body"] == inner.body and third["headers"][b"etag"] != etag
+    assert inner.calls == 2
+
+
+class WriteDuringReadApp:
+    """模擬慢查詢：handler 讀到舊資料後、回應送出前，另一個請求寫入並 invalidate。"""
+
+    def __init__(self, store):
+        self.store = store
+        self.version = 1
+
+    async def __call__(self, scope, receive, send):
+        body = b'{"v":%d}' % self.version
+        self.version += 1
+        await self.store.invalidate_tags("cards")
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/json")]})
+        await send({"type": "http.response.body", "body": body})
+
+
+@pytest.mark.parametrize("backend", ["lru", "redis"])
+def test_middleware_skips_store_when_invalidated_mid_request(clock, backend):
+    store = LRUCache() if backend == "lru" else RedisCache(FakeRedis(clock))
+    inner = WriteDuringReadApp(store)
+    app = ResponseCacheMiddleware(inner, rules={"/cards": "cards"}, cache=store)
+    assert request(app)["body"] == b'{"v":1}'
+    # 舊結果沒有被寫進快取，下一個請求重新讀取
+    assert request(app)["body"] == b'{"v":2}'
+    key = ResponseCacheMiddleware.cache_key({"path": "/cards/", "query_string": b"", "headers": []})
+    assert run(store.get(key)) is None
+
+
+def test_middleware_key_ignores_authorization_and_query_order(clock):
+    store = LRUCache()
+    inner = CountingApp()
+    app = ResponseCacheMiddleware(inner, rules={"/cards": "cards"}, cache=store)
+    request(app, query=b"limit=20&cursor=a")
+    request(app, query=b"cursor=a&limit=20", headers=[(b"authorization", b"Bearer x")])
+    request(app, query=b"cursor=a&limit=20", headers=[(b"authorization", b"Bearer y")])
+    assert inner.calls == 1 and store.stats.entries == 1
+
+
+def test_middleware_skips_non_json_and_unmatched(clock):
+    store = LRUCache()
+    ndjson = CountingApp(body=b"{}\n", content_type=b"application/x-ndjson")
+    app = ResponseCacheMiddleware(ndjson, rules={"/cards": "cards"}, cache=store)
+    request(app, path="/cards/export")
+    request(app, path="/cards/export")
+    request(app, path="/journals/")
+    request(app, method="POST")
+    assert ndjson.calls == 4 and store.stats.entries == 0
+
+
+def test_redis_payload_is_json(clock):
+    client = FakeRedis(clock)
+    run(RedisCache(client).set("k", entry()))
+    payload = json.loads(client.data["jq:cache:k"])
+    assert payload["tags"] == ["cards"] and payload["route"] == "/cards/"
@@ -0,0 +1,132 @@
+# tests/test_home.py
+# services/api/services/home_service.py：streak 計算、整筆重算與增量更新（含補登較舊日記的重算分支）、
+# 依 APP_TIMEZONE 切日
+#
+#   python -m pytest -q tests
+import asyncio
+from datetime import date, datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from services.api import database
+from services.api.models.journal import Journal
+from services.api.models.user import User
+from services.api.models.user_summary import UserSummary
+from services.api.services import home_service
+from services.api.services.home_service import _streaks
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def utc(*args) -> datetime:
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def taipei(monkeypatch):
+    # local_date() 與 SQLite 的 jq_local_date() 都讀 database.APP_TZ
+    monkeypatch.setattr(database, "APP_TZ", ZoneInfo("Asia/Taipei"))
+
+
+@pytest.fixture
+def db_with_user(sessions, taipei):
+    async def seed():
+        async with sessions() as db:
+            db.add(User(id=1, email="u@example.com"))
+            await db.commit()
+
+    run(seed())
+    return sessions
+
+
+def _write_journals(sessions, created: list[datetime], rebuild: bool = False) -> UserSummary:
+    """新增日記並走寫入時的增量路徑（on_journals_written）；rebuild=True 改成整筆重算。"""
+
+    async def write():
+        async with sessions() as db:
+            journals = [Journal(user_id=1, title=f"j{i}", content="", created_at=ts) for i, ts in enumerate(created)]
+            db.add_all(journals)
+            await db.flush()
+            if rebuild:
+                await home_service.rebuild_summary(db, 1)
+            else:
+                await home_service.on_journals_written(db, 1, journals)
+            await db.commit()
+        async with sessions() as db:
+            return await db.get(UserSummary, 1)
+
+    return run(write())
+
+
+def _rebuilt(sessions) -> UserSummary:
+    async def rebuild():
+        async with sessions() as db:
+            summary = await home_service.rebuild_summary(db, 1)
+            await db.commit()
+            return summary
+
+    return run(rebuild())
+
+
+def _fields(summary: UserSummary) -> tuple:
+    return (summary.journal_count, summary.streak_days, summary.longest_streak, summary.last_journal_date)
+
+
+# ---------------------------------------------------------------- _streaks
+@pytest.mark.parametrize(
+    "days, expected",
+    [
+        ([], (0, 0)),
+        ([date(2026, 1, 5)], (1, 1)),
+        ([date(2026, 1, 5), date(2026, 1, 4), date(2026, 1, 3)], (3, 3)),
+        # 最近一段 2 天，較早一段 3 天
+        ([date(2026, 1, 9), date(2026, 1, 8), date(2026, 1, 5), date(2026, 1, 4), date(2026, 1, 3)], (2, 3)),
+        ([date(2026, 1, 9), date(2026, 1, 7), date(2026, 1, 6)], (1, 2)),
+    ],
+)
+def test_streaks(days, expected):
+    assert _streaks(days) == expected
+
+
+# ---------------------------------------------------------------- 增量與重算
+def test_incremental_updates_match_rebuild(db_with_user):
+    summary = _write_journals(db_with_user, [utc(2026, 1, 1, 2), utc(2026, 1, 1, 3)])
+    assert _fields(summary) == (2, 1, 1, date(2026, 1, 1))
+    summary = _write_journals(db_with_user, [utc(2026, 1, 2, 2)])
+    assert _fields(summary) == (3, 2, 2, date(2026, 1, 2))
+    summary = _write_journals(db_with_user, [utc(2026, 1, 5, 2)])
+    assert _fields(summary) == (4, 1, 2, date(2026, 1, 5))
+    assert [j["title"] for j in summary.recent_journals] == ["j0", "j0", "j1", "j0"]
+    assert _fields(_rebuilt(db_with_user)) == _fields(summary)
+
+
+def test_backdated_journal_triggers_rebuild(db_with_user):
+    _write_journals(db_with_user, [utc(2026, 1, 1, 2), utc(2026, 1, 3, 2), utc(2026, 1, 4, 2)])
+    # 離線補登 1/2：三段接成一段 4 天，增量路徑算不出來，必須整筆重算
+    summary = _write_journals(db_with_user, [utc(2026, 1, 2, 2)])
+    assert _fields(summary) == (4, 4, 4, date(2026, 1, 4))
+    # 快照依 created_at 排序，補登的那篇排在中間
+    assert [j["created_at"][:10] for j in summary.recent_journals] == [
+        "2026-01-04",
+        "2026-01-03",
+        "2026-01-02",
+        "2026-01-01",
+    ]
+
+
+# ---------------------------------------------------------------- 時區
+def test_days_split_at_app_timezone_midnight(db_with_user):
+    # 台北 1/1 23:59 與 1/2 00:01：UTC 是同一天，應算成連續兩天
+    summary = _write_journals(db_with_user, [utc(2026, 1, 1, 15, 59)])
+    summary = _write_journals(db_with_user, [utc(2026, 1, 1, 16, 1)])
+    assert _fields(summary) == (2, 2, 2, date(2026, 1, 2))
+    assert _fields(_rebuilt(db_with_user)) == (2, 2, 2, date(2026, 1, 2))
+
+
+def test_same_local_day_across_utc_midnight(db_with_user):
+    # 台北 1/2 07:30 與 1/2 08:30：UTC 分屬 1/1 與 1/2，仍是同一天
+    summary = _write_journals(db_with_user, [utc(2026, 1, 1, 23, 30), utc(2026, 1, 2, 0, 30)], rebuild=True)
+    assert _fields(summary) == (2, 1, 1, date(2026, 1, 2))
@@ -0,0 +1,38 @@
+# tests/test_metrics.py
+# services/api/metrics.py：instrument_engine 的 DB 時間累計（含執行失敗的語句）
+#
+#   python -m pytest -q tests
+import asyncio
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from services.api import metrics
+
+
+def test_failed_statement_does_not_leak_start_time():
+    async def scenario():
+        # StaticPool：所有語句共用同一條連線，才看得到 conn.info 上殘留的起始時間
+        engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+        metrics.instrument_engine(engine)
+        acc = [0.0]
+        token = metrics._db_time.set(acc)
+        try:
+            async with engine.connect() as conn:
+                for _ in range(3):
+                    with pytest.raises(OperationalError):
+                        await conn.execute(text("SELECT * FROM missing_table"))
+                await conn.execute(text("SELECT 1"))
+                raw = await conn.get_raw_connection()
+                stack = raw.info.get("_metrics_t0")
+        finally:
+            metrics._db_time.reset(token)
+            await engine.dispose()
+        return stack, acc[0]
+
+    stack, db_seconds = asyncio.run(scenario())
+    assert stack == []
+    assert db_seconds > 0
@@ -0,0 +1,180 @@
+# tests/test_search.py
+# search_service 的 SQLite 路徑：models/journal.py 的二連組 token、FTS5 trigger 同步、_fts_query 與
+# rank 游標翻頁；以「子字串比對」當標準答案，確認索引查詢與 LIKE 的結果一致
+#
+#   python -m pytest -q tests
+import asyncio
+import random
+
+import pytest
+from sqlalchemy import delete, update
+
+from services.api.models.journal import Journal, search_tokens
+from services.api.models.user import User
+from services.api.pagination import PageParams
+from services.api.services import batch_service, search_service
+from services.api.services.search_service import _fts_query
+
+USERS = (1, 12)
+ALPHABET = "拜龍山寺aB1 ，_"
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def _search(sessions, user_id: int, q: str, limit: int = 50) -> list[int]:
+    """翻完所有頁，回傳依序的 journal id。"""
+
+    async def search():
+        ids, cursor = [], None
+        async with sessions() as db:
+            while True:
+                rows, cursor = await search_service.search_journals(
+                    db, user_id, q, [], PageParams(cursor=cursor, limit=limit)
+                )
+                ids += [row.id for row in rows]
+                if cursor is None:
+                    return ids
+
+    return run(search())
+
+
+def _write(sessions, *statements_or_rows) -> None:
+    async def write():
+        async with sessions() as db:
+            for item in statements_or_rows:
+                if isinstance(item, list):
+                    db.add_all(item)
+                    await db.flush()
+                else:
+                    await db.execute(item)
+            await db.commit()
+
+    run(write())
+
+
+@pytest.fixture
+def db_with_users(sessions):
+    _write(sessions, [User(id=uid, email=f"u{uid}@example.com") for uid in USERS])
+    return sessions
+
+
+# ---------------------------------------------------------------- token / 查詢字串
+def test_search_tokens_are_prefixed_bigrams_per_run():
+    assert search_tokens(1, "龍山寺") == "1x龍山 1x山寺 1x寺"
+    # 標點、底線、空白都是分隔；大小寫保留給 unicode61 折疊
+    assert search_tokens(12, "aB_c，1") == "12xaB 12xB 12xc 12x1"
+    assert search_tokens(1, None) == ""
+
+
+def test_fts_query_phrases_and_prefixes():
+    assert _fts_query(1, "龍山寺") == '"1x龍山 1x山寺"'
+    assert _fts_query(1, "寺") == '"1x寺"*'
+    # 詞內標點視為分隔，各片段 AND
+    assert _fts_query(12, "C++") == '"12xC"*'
+    assert _fts_query(1, "a-bc") == '"1xa"* "1xbc"'
+    assert _fts_query(1, "，_") is None
+
+
+# ---------------------------------------------------------------- FTS 與子字串比對一致
+def test_randomized_search_matches_substring_semantics(db_with_users):
+    rng = random.Random(7)
+    docs = {}
+    for journal_id in range(1, 301):
+        user_id = USERS[journal_id % 2]
+        title = "".join(rng.choices(ALPHABET, k=rng.randint(0, 6)))
+        content = "".join(rng.choices(ALPHABET, k=rng.randint(0, 25)))
+        docs[journal_id] = (user_id, title, content)
+    _write(
+        db_with_users,
+        [Journal(id=i, user_id=u, title=t, content=c) for i, (u, t, c) in docs.items()],
+    )
+
+    letters = ALPHABET.replace(" ", "").replace("，", "").replace("_", "")
+    for _ in range(150):
+        terms = ["".join(rng.choices(letters, k=rng.randint(1, 4))) for _ in range(rng.randint(1, 2))]
+        user_id = rng.choice(USERS)
+        expected = {
+            i
+            for i, (u, t, c) in docs.items()
+            if u == user_id and all(term.lower() in t.lower() or term.lower() in c.lower() for term in terms)
+        }
+        got = _search(db_with_users, user_id, " ".join(terms), limit=20)
+        assert len(got) == len(set(got)), terms
+        assert set(got) == expected, terms
+
+
+# ---------------------------------------------------------------- trigger 同步
+def test_index_follows_insert_update_and_delete(db_with_users):
+    _write(db_with_users, [Journal(id=1, user_id=1, title="龍山寺", content="拜拜")])
+    assert _search(db_with_users, 1, "山寺") == [1]
+
+    _write(db_with_users, update(Journal).where(Journal.id == 1).values(title="夜市", content="蚵仔煎"))
+    assert _search(db_with_users, 1, "山寺") == []
+    assert _search(db_with_users, 1, "蚵仔") == [1]
+
+    _write(db_with_users, delete(Journal).where(Journal.id == 1))
+    assert _search(db_with_users, 1, "蚵仔") == []
+
+
+def test_index_follows_batch_upsert(db_with_users):
+    async def upsert(items):
+        async with db_with_users() as db:
+            result = await batch_service.upsert_journals(db, 1, items)
+            await db.commit()
+            return result
+
+    first = run(upsert([{"client_id": "a", "title": "龍山寺"}, {"client_id": "b", "content": "夜市"}]))
+    assert first["created"] == 2
+    assert len(_search(db_with_users, 1, "龍山")) == 1
+    # 重送同一個 client_id 走 ON CONFLICT DO UPDATE，trigger 一樣要換掉舊 token
+    second = run(upsert([{"client_id": "a", "title": "大稻埕"}]))
+    assert second["updated"] == 1
+    assert _search(db_with_users, 1, "龍山") == []
+    assert len(_search(db_with_users, 1, "稻埕")) == 1
+
+
+def test_search_is_isolated_per_user(db_with_users):
+    # user 1 的 "2x..." 與 user 12 的 token 前綴只差在分隔位置，不能互相命中
+    _write(
+        db_with_users,
+        [
+            Journal(id=1, user_id=1, title="2x龍山", content=""),
+            Journal(id=2, user_id=12, title="龍山", content=""),
+            Journal(id=3, user_id=1, title="x龍", content=""),
+        ],
+    )
+    assert _search(db_with_users, 12, "龍山") == [2]
+    assert _search(db_with_users, 12, "2x") == []
+    assert _search(db_with_users, 12, "x") == []
+    assert sorted(_search(db_with_users, 1, "龍")) == [1, 3]
+    assert _search(db_with_users, 1, "2x龍") == [1]
+
+
+# ---------------------------------------------------------------- 排名與游標
+def test_rank_cursor_second_page(db_with_users):
+    _write(
+        db_with_users,
+        [
+            Journal(id=1, user_id=1, title="", content="龍山寺"),
+            Journal(id=2, user_id=1, title="龍山寺", content="龍山寺"),
+            Journal(id=3, user_id=1, title="龍山寺", content=""),
+            Journal(id=4, user_id=1, title="", content="龍山寺 附近"),
+            Journal(id=5, user_id=1, title="夜市", content=""),
+        ],
+    )
+    everything = _search(db_with_users, 1, "龍山寺", limit=10)
+    assert sorted(everything) == [1, 2, 3, 4]
+    # 標題命中的權重較高
+    assert set(everything[:2]) == {2, 3}
+
+    async def pages():
+        async with db_with_users() as db:
+            first, cursor = await search_service.search_journals(db, 1, "龍山寺", [], PageParams(cursor=None, limit=3))
+            second, last = await search_service.search_journals(db, 1, "龍山寺", [], PageParams(cursor=cursor, limit=3))
+            return [j.id for j in first], cursor, [j.id for j in second], last
+
+    first, cursor, second, last = run(pages())
+    assert cursor is not None and last is None
+    assert first + second == everything and len(second) == 1